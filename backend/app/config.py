@@ -31,6 +31,9 @@ class Settings(BaseSettings):
     auto_refresh_interval_minutes: int = 5
     agent_cycle_interval_minutes: int = 5
 
+    # Compile the Matrix Profile kernels in the background at startup
+    mp_warmup_enabled: bool = True
+
     # Hyperliquid (API keys via .env)
     hyperliquid_wallet_address: str = ""
     hyperliquid_api_secret: str = ""
@@ -2,6 +2,7 @@
 FastAPI Application — Reversal Detection Pro v3.0
 """
 
+import asyncio
 import logging
 import time
 import uuid
@@ -31,6 +32,21 @@ async def lifespan(app: FastAPI):
 
     settings = get_settings()
 
+    if settings.mp_warmup_enabled:
+        # Keep stumpy's multi-second JIT out of the first analysis request
+        from reversal_pro.application.services.matrix_profile_service import (
+            MatrixProfileService,
+        )
+
+        async def _warm_matrix_profile():
+            try:
+                await asyncio.to_thread(MatrixProfileService.warmup)
+                logger.info("Matrix Profile kernels warmed up")
+            except Exception as e:
+                logger.warning(f"Matrix Profile warm-up failed: {e}")
+
+        app.state.mp_warmup = asyncio.create_task(_warm_matrix_profile())
+
     # Start background scheduler for auto-refresh
     if settings.auto_refresh_enabled:
         try:
@@ -244,6 +260,19 @@ async def lifespan(app: FastAPI):
             app.state.scheduler.shutdown(wait=False)
         except Exception:
             pass
+    mp_warmup = getattr(app.state, "mp_warmup", None)
+    if mp_warmup is not None and not mp_warmup.done():
+        mp_warmup.cancel()
+        try:
+            await mp_warmup
+        except (asyncio.CancelledError, Exception):
+            pass
+    try:
+        from .dependencies import get_telegram_service
+        # Sends queued / coalesced notifications before stopping the outbox
+        await get_telegram_service().close()
+    except Exception as e:
+        logger.warning(f"Telegram shutdown failed: {e}")
     try:
         from .dependencies import get_ingestion_service
         await get_ingestion_service().close_exchanges()
@@ -66,6 +66,7 @@ class AgentCrudMixin:
         agent.name = f"agent_{agent.id}"
         await db.commit()
         await db.refresh(agent)
+        telegram_service.invalidate_summaries()
 
         await self._log(db, agent.id, "AGENT_CREATED", {
             "symbol": symbol, "timeframe": timeframe,
@@ -93,6 +94,7 @@ class AgentCrudMixin:
 
         await db.delete(agent)
         await db.commit()
+        telegram_service.invalidate_summaries()
 
         logger.info(f"Agent deleted: {agent_name} (all positions and logs cascade deleted)")
         return True
@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...models import Agent, AgentPosition
 from ..hyperliquid_client import hyperliquid_client
+from ..telegram_service import telegram_service
 
 logger = logging.getLogger(__name__)
 
@@ -261,6 +262,7 @@ class RiskManagerMixin:
                 old_sl = pos.stop_loss
                 pos.stop_loss = new_sl
                 await db.commit()
+                telegram_service.invalidate_summaries()
                 logger.info(
                     f"[{agent.name}] TRAILING STOP updated for LONG: "
                     f"SL {old_sl:.2f} → {new_sl:.2f} "
@@ -281,6 +283,7 @@ class RiskManagerMixin:
                 old_sl = pos.stop_loss
                 pos.stop_loss = new_sl
                 await db.commit()
+                telegram_service.invalidate_summaries()
                 logger.info(
                     f"[{agent.name}] TRAILING STOP updated for SHORT: "
                     f"SL {old_sl:.2f} → {new_sl:.2f} "
@@ -322,6 +325,7 @@ class RiskManagerMixin:
                 old_sl = pos.stop_loss
                 pos.stop_loss = pos.entry_price
                 await db.commit()
+                telegram_service.invalidate_summaries()
                 logger.info(
                     f"[{agent.name}] BREAKEVEN activated for LONG: "
                     f"SL moved {old_sl:.2f} → {pos.entry_price:.2f} "
@@ -339,6 +343,7 @@ class RiskManagerMixin:
                 old_sl = pos.stop_loss
                 pos.stop_loss = pos.entry_price
                 await db.commit()
+                telegram_service.invalidate_summaries()
                 logger.info(
                     f"[{agent.name}] BREAKEVEN activated for SHORT: "
                     f"SL moved {old_sl:.2f} → {pos.entry_price:.2f} "
@@ -10,12 +10,12 @@ combo per TF is used to create an inactive agent.
 import asyncio
 import functools
 import logging
+import math
 import time
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
 
-import numpy as np
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -23,7 +23,9 @@ from ..cache import cache_get, cache_set, cache_delete, get_redis_client
 
 # Core engine imports
 from reversal_pro.domain.enums import SignalMode, SensitivityPreset, CalculationMethod
-from reversal_pro.domain.value_objects import SensitivityConfig, OHLCVBar as CoreOHLCVBar
+from reversal_pro.domain.value_objects import (
+    SensitivityConfig, OHLCVBar as CoreOHLCVBar, BarSeries,
+)
 from reversal_pro.application.use_cases.detect_reversals import DetectReversalsUseCase
 
 logger = logging.getLogger(__name__)
@@ -151,6 +153,7 @@ def _run_backtest(
     use_candle_patterns: bool = True,
     use_cusum: bool = True,
     trade_amount: float = 100.0,
+    series: Optional[BarSeries] = None,
 ) -> BacktestResult:
     """
     Run the reversal detection engine and simulate trades **realistically**:
@@ -158,6 +161,9 @@ def _run_backtest(
     - Breakeven: SL moves to entry after price reaches 1× risk.
     - Partial TP at TP1 (50%), then target TP2.
     - Trailing stop after breakeven (tracks best price − 1× risk).
+
+    ``series`` is ``BarSeries.from_bars(bars)``; pass it when running many
+    parameter combinations over the same bars.
     """
     n = len(bars)
     if n < 50:
@@ -188,7 +194,9 @@ def _run_backtest(
             use_candle_patterns=use_candle_patterns,
             use_cusum=use_cusum,
         )
-        result = use_case.execute(bars)
+        if series is None:
+            series = BarSeries.from_bars(bars)
+        result = use_case.execute(series)
     except Exception as e:
         logger.warning(f"Backtest engine error ({sensitivity}/{signal_mode}/{timeframe}): {e}")
         return BacktestResult(
@@ -214,11 +222,8 @@ def _run_backtest(
         )
 
     # ATR values for SL calculation
-    highs = np.array([b.high for b in bars], dtype=float)
-    lows = np.array([b.low for b in bars], dtype=float)
-    closes = np.array([b.close for b in bars], dtype=float)
     from reversal_pro.application.services.atr_service import ATRService
-    atr_values = ATRService().atr(highs, lows, closes, atr_length)
+    atr_values = ATRService().atr(series.highs, series.lows, series.closes, atr_length)
 
     rr_ratio, atr_mult, max_sl_pct, fallback_sl_pct = _get_tf_params(timeframe)
 
@@ -336,7 +341,7 @@ def _run_backtest(
 
             entry_price = sig.actual_price
             side = "LONG" if sig.is_bullish else "SHORT"
-            atr = atr_values[i] if i < len(atr_values) and not np.isnan(atr_values[i]) else None
+            atr = atr_values[i] if i < len(atr_values) and not math.isnan(atr_values[i]) else None
 
             # SL from opposite pivot
             pivot_price = None
@@ -655,6 +660,8 @@ class OptimizerService:
                     continue
 
                 best_result: Optional[BacktestResult] = None
+                # Column arrays shared by every combination on this timeframe
+                series = BarSeries.from_bars(bars)
 
                 for sensitivity in sens_grid:
                     for signal_mode in mode_grid:
@@ -696,6 +703,7 @@ class OptimizerService:
                                                 use_volume_adaptive=va,
                                                 use_candle_patterns=cp,
                                                 use_cusum=cu,
+                                                series=series,
                                             ),
                                         )
 
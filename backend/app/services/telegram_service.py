@@ -9,56 +9,269 @@ Features:
 
 import asyncio
 import logging
-from datetime import datetime, timezone
-from typing import Optional, List, Dict
+import sqlite3
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import Optional, List, Dict, Mapping, Set
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
 import httpx
+import orjson
 
 from ..models import Agent, AgentPosition
 from ..config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Seconds a rendered summary stays valid while no position has changed.
+SUMMARY_CACHE_TTL = 15.0
+
+# Seconds the outbox waits for more position notifications of the same
+# kind before sending; bursts inside the window go out as one digest.
+COALESCE_WINDOW = 0.5
+
+# Position age in whole hours (truncated, never rounded), computed by the
+# database so the summary loop does no datetime arithmetic. Keyed by
+# SQLAlchemy dialect name.
+AGE_HOURS_SQL = {
+    "postgresql": "FLOOR(EXTRACT(EPOCH FROM (NOW() - p.opened_at)) / 3600)::int",
+    "sqlite": "CAST((julianday('now') - julianday(p.opened_at)) * 24 AS INTEGER)",
+}
+
+# Outbox sentinel telling the worker to exit
+_STOP = None
+
+# Fire-and-forget sends: concurrent HTTP requests and max pending tasks.
+MAX_CONCURRENT_SENDS = 20
+MAX_PENDING_SENDS = 100
+SIGNAL_TASK_NAME = "telegram-signal"
+
+# Summary queries, built once at import instead of on every command.
+_AGENTS_SUMMARY_SQL = """
+    SELECT a.id, a.name, a.symbol, a.timeframe, a.is_active, a.mode,
+           COALESCE(ps.open_positions, 0) as open_positions,
+           COALESCE(ps.total_pnl, 0) as total_pnl,
+           COALESCE(ps.wins, 0) as wins,
+           COALESCE(ps.losses, 0) as losses
+    FROM agents a
+    LEFT JOIN (
+        SELECT agent_id, {aggregates}
+        FROM agent_positions
+        WHERE status IN ('OPEN', 'CLOSED')
+        GROUP BY agent_id
+    ) ps ON ps.agent_id = a.id
+    ORDER BY a.id
+"""
+
+# Aggregate FILTER clauses let the planner compute every counter in one
+# pass; SQLite only understands them from 3.30 on.
+_AGG_FILTER = """COUNT(*) FILTER (WHERE status = 'OPEN') as open_positions,
+               SUM(pnl) FILTER (WHERE status = 'CLOSED') as total_pnl,
+               COUNT(*) FILTER (WHERE status = 'CLOSED' AND pnl > 0) as wins,
+               COUNT(*) FILTER (WHERE status = 'CLOSED' AND pnl < 0) as losses"""
+_AGG_CASE = """COUNT(CASE WHEN status = 'OPEN' THEN 1 END) as open_positions,
+               SUM(CASE WHEN status = 'CLOSED' THEN pnl ELSE 0 END) as total_pnl,
+               COUNT(CASE WHEN status = 'CLOSED' AND pnl > 0 THEN 1 END) as wins,
+               COUNT(CASE WHEN status = 'CLOSED' AND pnl < 0 THEN 1 END) as losses"""
+
+_AGENTS_SUMMARY_STMTS = {
+    "postgresql": text(_AGENTS_SUMMARY_SQL.format(aggregates=_AGG_FILTER)),
+    "sqlite": text(_AGENTS_SUMMARY_SQL.format(
+        aggregates=_AGG_FILTER if sqlite3.sqlite_version_info >= (3, 30) else _AGG_CASE
+    )),
+}
+
+_OPEN_POSITIONS_SQL = """
+    SELECT p.id, a.name, p.symbol, p.side, p.entry_price,
+           p.stop_loss, p.take_profit, p.quantity,
+           {age_hours} AS age_hours
+    FROM agent_positions p
+    JOIN agents a ON p.agent_id = a.id
+    WHERE p.status = 'OPEN'
+    ORDER BY p.opened_at DESC
+"""
+_OPEN_POSITIONS_STMTS = {
+    dialect: text(_OPEN_POSITIONS_SQL.format(age_hours=expr))
+    for dialect, expr in AGE_HOURS_SQL.items()
+}
+
+# /status in one round-trip: both summaries as tagged rows of a single
+# UNION ALL. Agent rows carry (label=timeframe, v1..v4=open/pnl/wins/losses),
+# position rows (label=side, v1..v4=entry/sl/tp/qty, v5=age_hours).
+_STATUS_SQL = """
+    WITH agent_rows AS ({agents}),
+    position_rows AS (
+        SELECT p.id, a.name, p.symbol, p.side, p.entry_price,
+               p.stop_loss, p.take_profit, p.quantity,
+               {age_hours} AS age_hours,
+               ROW_NUMBER() OVER (ORDER BY p.opened_at DESC) AS ord
+        FROM agent_positions p
+        JOIN agents a ON p.agent_id = a.id
+        WHERE p.status = 'OPEN'
+    )
+    SELECT 'agent' AS kind, id AS ord, name, symbol, timeframe AS label,
+           mode, is_active, open_positions AS v1, total_pnl AS v2,
+           wins AS v3, losses AS v4, NULL AS v5
+    FROM agent_rows
+    UNION ALL
+    SELECT 'position' AS kind, ord, name, symbol, side AS label,
+           NULL AS mode, NULL AS is_active, entry_price AS v1, stop_loss AS v2,
+           take_profit AS v3, quantity AS v4, age_hours AS v5
+    FROM position_rows
+    ORDER BY kind, ord
+"""
+_STATUS_STMTS = {
+    dialect: text(_STATUS_SQL.format(
+        agents=stmt.text, age_hours=AGE_HOURS_SQL[dialect],
+    ))
+    for dialect, stmt in _AGENTS_SUMMARY_STMTS.items()
+}
+
+DIGEST_HEADERS: Mapping[str, str] = MappingProxyType({
+    "opened": "🟢 *{count} Positions Opened*",
+    "closed": "📋 *{count} Positions Closed*",
+})
+
+MODE_EMOJI: Mapping[str, str] = MappingProxyType({"paper": "📝", "live": "💰"})
+SIDE_EMOJI: Mapping[str, str] = MappingProxyType({"LONG": "🟢", "SHORT": "🔴"})
+
+REASON_LABELS: Mapping[str, str] = MappingProxyType({
+    "STOP_LOSS": "Stop Loss",
+    "TRAILING_STOP": "Trailing Stop",
+    "TAKE_PROFIT": "Take Profit",
+    "TAKE_PROFIT_2": "Take Profit 2",
+    "PARTIAL_TP1": "TP1 Partiel (50%)",
+    "BULLISH_REVERSAL": "Reversal Bullish",
+    "BEARISH_REVERSAL": "Reversal Bearish",
+    "MANUAL_CLOSE": "Fermeture manuelle",
+})
+
 
 class TelegramService:
     """Handles Telegram Bot notifications and commands."""
 
+    # (enabled, bot_token, chat_id, base_url) shared by all instances
+    _CACHED_CONFIG: Optional[tuple] = None
+
     def __init__(self):
         self._client: Optional[httpx.AsyncClient] = None
         self._enabled = False
         self._bot_token = ""
         self._chat_id = ""
         self._base_url = ""
+        # Rendered command summaries: key → (positions_version, monotonic ts, text)
+        self._summary_cache: Dict[str, tuple] = {}
+        self._positions_version = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # Outbox for position notifications: (kind, full_text, digest_line)
+        self._outbox: Optional[asyncio.Queue] = None
+        self._outbox_worker: Optional[asyncio.Task] = None
+        self._deferred: deque = deque()
+        self.coalesce_window = COALESCE_WINDOW
+        # Background sends for the remaining notify_* methods
+        self._fire_and_forget: Set[asyncio.Task] = set()
+        self._send_sem = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
         self._initialize()
 
     def _initialize(self):
-        """Initialize Telegram settings from config."""
+        """Initialize Telegram settings from config.
+
+        Settings are resolved once per process and cached on the class, so
+        further instances just copy the already-built base URL and flags.
+        """
+        cls = type(self)
+        if cls._CACHED_CONFIG is None:
+            cls._CACHED_CONFIG = cls._load_config()
+        self._enabled, self._bot_token, self._chat_id, self._base_url = cls._CACHED_CONFIG
+
+        if self._enabled:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return  # no loop yet — the first notification starts it
+            self._ensure_worker()
+
+    @staticmethod
+    def _load_config() -> tuple:
         settings = get_settings()
-        self._enabled = settings.telegram_enabled
-        self._bot_token = settings.telegram_bot_token
-        self._chat_id = settings.telegram_chat_id
-
-        if self._enabled and self._bot_token:
-            self._base_url = f"https://api.telegram.org/bot{self._bot_token}"
-            logger.info(f"Telegram service initialized (chat_id: {self._chat_id})")
-        elif self._enabled:
+        enabled = settings.telegram_enabled
+        bot_token = settings.telegram_bot_token
+        chat_id = settings.telegram_chat_id
+        base_url = ""
+
+        if enabled and bot_token:
+            base_url = f"https://api.telegram.org/bot{bot_token}"
+            logger.info("Telegram service initialized (chat_id: %s)", chat_id)
+        elif enabled:
             logger.warning("Telegram enabled but bot token not configured")
-            self._enabled = False
+            enabled = False
         else:
             logger.info("Telegram service disabled")
+        return enabled, bot_token, chat_id, base_url
+
+    @classmethod
+    def reload_config(cls):
+        """Forget the cached settings; the next instance re-reads them."""
+        cls._CACHED_CONFIG = None
+
+    # ── Summary cache ────────────────────────────────────────
+    def invalidate_summaries(self):
+        """Drop cached summaries — call whenever positions or agents change."""
+        self._positions_version += 1
+        self._summary_cache.clear()
+
+    def _get_cached_summary(self, key: str) -> Optional[str]:
+        """Return a cached summary if still fresh for the current version."""
+        entry = self._summary_cache.get(key)
+        if entry is not None:
+            version, ts, summary = entry
+            if (version == self._positions_version
+                    and time.monotonic() - ts < SUMMARY_CACHE_TTL):
+                self._cache_hits += 1
+                return summary
+        self._cache_misses += 1
+        return None
+
+    def _store_summary(self, key: str, summary: str) -> str:
+        self._summary_cache[key] = (self._positions_version, time.monotonic(), summary)
+        return summary
+
+    def cache_info(self) -> dict:
+        """Summary cache counters (debug / metrics)."""
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "currsize": len(self._summary_cache),
+            "ttl": SUMMARY_CACHE_TTL,
+            "positions_version": self._positions_version,
+        }
 
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=10.0)
+        """Return the shared HTTP client, created once and kept until close()."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                headers={"Content-Type": "application/json"},
+                timeout=10.0,
+            )
         return self._client
 
     async def close(self):
-        """Close HTTP client."""
-        if self._client and not self._client.is_closed:
+        """Drain and stop the outbox worker and background sends, then close
+        the HTTP client."""
+        if self._outbox_worker is not None and not self._outbox_worker.done():
+            self._outbox.put_nowait(_STOP)
+            await self._outbox_worker
+        self._outbox_worker = None
+        # Pending sends would otherwise reopen a client after aclose()
+        if self._fire_and_forget:
+            await asyncio.gather(*self._fire_and_forget, return_exceptions=True)
+        if self._client is not None:
             await self._client.aclose()
+            self._client = None
 
     async def send_message(self, text: str, parse_mode: str = "Markdown") -> bool:
         """
@@ -77,93 +290,208 @@ class TelegramService:
 
         try:
             client = await self._get_client()
-            logger.debug(f"Sending Telegram message to {self._chat_id}")
+            logger.debug("Sending Telegram message to %s", self._chat_id)
             response = await client.post(
-                f"{self._base_url}/sendMessage",
-                json={
+                "/sendMessage",
+                content=orjson.dumps({
                     "chat_id": self._chat_id,
                     "text": text,
                     "parse_mode": parse_mode,
                     "disable_web_page_preview": True,
-                }
+                }),
             )
 
             if response.status_code == 200:
                 logger.debug("Telegram message sent successfully")
                 return True
             else:
-                logger.error(f"Telegram API error: {response.status_code} - {response.text}")
+                logger.error(
+                    "Telegram API error: %s - %s", response.status_code, response.text
+                )
                 return False
 
         except Exception as e:
-            logger.error(f"Failed to send Telegram message: {e}", exc_info=True)
+            logger.error("Failed to send Telegram message: %s", e, exc_info=True)
             return False
 
+    # ── Outbox (coalesced position notifications) ───────────
+    def _ensure_worker(self):
+        """Start the outbox worker if it is not already running."""
+        if self._outbox is None:
+            self._outbox = asyncio.Queue()
+        if self._outbox_worker is None or self._outbox_worker.done():
+            self._outbox_worker = asyncio.create_task(self._run_outbox())
+
+    def _enqueue(self, kind: str, text: str, digest_line: str):
+        """Queue a position notification for the outbox worker."""
+        self._ensure_worker()
+        self._outbox.put_nowait((kind, text, digest_line))
+
+    async def flush(self):
+        """Wait until every queued or in-flight notification has been sent."""
+        if self._outbox is not None:
+            await self._outbox.join()
+        if self._fire_and_forget:
+            await asyncio.gather(*self._fire_and_forget, return_exceptions=True)
+
+    async def _send_guarded(self, text: str, parse_mode: str = "Markdown") -> bool:
+        async with self._send_sem:
+            return await self.send_message(text, parse_mode)
+
+    def _send_background(self, text: str, is_signal: bool = False):
+        """Schedule a send without blocking the caller.
+
+        When too many sends are pending, signal notifications are dropped
+        first so position and agent messages still get through.
+        """
+        if len(self._fire_and_forget) >= MAX_PENDING_SENDS:
+            victim = None
+            if not is_signal:
+                victim = next(
+                    (t for t in self._fire_and_forget
+                     if t.get_name() == SIGNAL_TASK_NAME and not t.done()),
+                    None,
+                )
+            if victim is None:
+                logger.warning("Telegram send backlog full, dropping notification")
+                return
+            victim.cancel()
+            self._fire_and_forget.discard(victim)
+            logger.warning("Telegram send backlog full, dropped a signal notification")
+
+        task = asyncio.create_task(
+            self._send_guarded(text),
+            name=SIGNAL_TASK_NAME if is_signal else None,
+        )
+        self._fire_and_forget.add(task)
+        task.add_done_callback(self._fire_and_forget.discard)
+
+    async def _next_item(self) -> tuple:
+        if self._deferred:
+            return self._deferred.popleft()
+        return await self._outbox.get()
+
+    async def _collect_batch(self, kind: str) -> list:
+        """Gather same-kind items arriving within the coalescing window."""
+        batch = [item for item in self._deferred if item is not _STOP and item[0] == kind]
+        if batch:
+            self._deferred = deque(
+                item for item in self._deferred if item is _STOP or item[0] != kind
+            )
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.coalesce_window
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._outbox.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if item is not _STOP and item[0] == kind:
+                batch.append(item)
+            else:
+                # Different kind or shutdown — keep its place in line
+                self._deferred.append(item)
+        return batch
+
+    async def _run_outbox(self):
+        """Single consumer: send queued notifications, merging bursts.
+
+        Owns the HTTP client for the lifetime of the service and exits
+        once close() enqueues the stop sentinel.
+        """
+        await self._get_client()
+        while True:
+            first = await self._next_item()
+            if first is _STOP:
+                self._outbox.task_done()
+                return
+            batch = [first]
+            try:
+                batch.extend(await self._collect_batch(first[0]))
+                if len(batch) == 1:
+                    message = first[1]
+                else:
+                    header = DIGEST_HEADERS[first[0]].format(count=len(batch))
+                    message = "\n".join([header, ""] + [item[2] for item in batch])
+                await self._send_guarded(message)
+            except Exception as e:
+                logger.error("Telegram outbox error: %s", e, exc_info=True)
+            finally:
+                for _ in batch:
+                    self._outbox.task_done()
+
     # ── Notification methods ─────────────────────────────────
     async def notify_position_opened(self, agent_name: str, symbol: str,
                                     side: str, entry_price: float,
                                     stop_loss: float, take_profit: float,
                                     quantity: float, mode: str):
         """Notify when a position is opened."""
+        self.invalidate_summaries()
+        if not self._enabled:
+            return
         risk = abs(entry_price - stop_loss)
         reward = abs(take_profit - entry_price)
         rr_ratio = reward / risk if risk > 0 else 0
 
-        emoji = "🟢" if side == "LONG" else "🔴"
-        mode_emoji = "📝" if mode == "paper" else "💰"
-
-        text = (
-            f"{emoji} *Position Opened* {mode_emoji}\n\n"
-            f"*Agent:* `{agent_name}`\n"
-            f"*Symbol:* `{symbol}`\n"
-            f"*Side:* `{side}`\n"
-            f"*Entry:* `{entry_price:.2f}`\n"
-            f"*Stop Loss:* `{stop_loss:.2f}`\n"
-            f"*Take Profit:* `{take_profit:.2f}`\n"
-            f"*Quantity:* `{quantity:.6f}`\n"
-            f"*R:R Ratio:* `{rr_ratio:.2f}`\n"
-            f"*Mode:* `{mode.upper()}`"
-        )
-
-        await self.send_message(text)
+        text = "".join((
+            SIDE_EMOJI.get(side, "🔴"), " *Position Opened* ",
+            MODE_EMOJI.get(mode, "💰"),
+            "\n\n*Agent:* `", agent_name,
+            "`\n*Symbol:* `", symbol,
+            "`\n*Side:* `", side,
+            "`\n*Entry:* `", f"{entry_price:.2f}",
+            "`\n*Stop Loss:* `", f"{stop_loss:.2f}",
+            "`\n*Take Profit:* `", f"{take_profit:.2f}",
+            "`\n*Quantity:* `", f"{quantity:.6f}",
+            "`\n*R:R Ratio:* `", f"{rr_ratio:.2f}",
+            "`\n*Mode:* `", mode.upper(), "`",
+        ))
+        digest_line = "".join((
+            "• ", SIDE_EMOJI.get(side, "🔴"), " `", agent_name, "` ",
+            side, " `", symbol, "` @ `", f"{entry_price:.2f}",
+            "` (SL `", f"{stop_loss:.2f}", "` / TP `", f"{take_profit:.2f}",
+            "`) ", MODE_EMOJI.get(mode, "💰"),
+        ))
+
+        self._enqueue("opened", text, digest_line)
 
     async def notify_position_closed(self, agent_name: str, symbol: str,
                                     side: str, entry_price: float,
                                     exit_price: float, pnl: float,
                                     pnl_percent: float, reason: str, mode: str):
         """Notify when a position is closed."""
-        emoji = "✅" if pnl > 0 else "❌"
-        mode_emoji = "📝" if mode == "paper" else "💰"
-
-        reason_labels = {
-            "STOP_LOSS": "Stop Loss",
-            "TRAILING_STOP": "Trailing Stop",
-            "TAKE_PROFIT": "Take Profit",
-            "TAKE_PROFIT_2": "Take Profit 2",
-            "PARTIAL_TP1": "TP1 Partiel (50%)",
-            "BULLISH_REVERSAL": "Reversal Bullish",
-            "BEARISH_REVERSAL": "Reversal Bearish",
-            "MANUAL_CLOSE": "Fermeture manuelle",
-        }
-        reason_display = reason_labels.get(reason, reason)
-
-        text = (
-            f"{emoji} *Position Closed* {mode_emoji}\n\n"
-            f"*Agent:* `{agent_name}`\n"
-            f"*Symbol:* `{symbol}`\n"
-            f"*Side:* `{side}`\n"
-            f"*Entry:* `{entry_price:.2f}`\n"
-            f"*Exit:* `{exit_price:.2f}`\n"
-            f"*PnL:* `{pnl:+.2f} ({pnl_percent:+.2f}%)`\n"
-            f"*Reason:* `{reason_display}`\n"
-            f"*Mode:* `{mode.upper()}`"
-        )
-
-        await self.send_message(text)
+        self.invalidate_summaries()
+        if not self._enabled:
+            return
+        text = "".join((
+            "✅" if pnl > 0 else "❌", " *Position Closed* ",
+            MODE_EMOJI.get(mode, "💰"),
+            "\n\n*Agent:* `", agent_name,
+            "`\n*Symbol:* `", symbol,
+            "`\n*Side:* `", side,
+            "`\n*Entry:* `", f"{entry_price:.2f}",
+            "`\n*Exit:* `", f"{exit_price:.2f}",
+            "`\n*PnL:* `", f"{pnl:+.2f}", " (", f"{pnl_percent:+.2f}", "%)",
+            "`\n*Reason:* `", REASON_LABELS.get(reason, reason),
+            "`\n*Mode:* `", mode.upper(), "`",
+        ))
+        digest_line = "".join((
+            "• ", "✅" if pnl > 0 else "❌", " `", agent_name, "` ",
+            side, " `", symbol, "` PnL `", f"{pnl:+.2f}",
+            " (", f"{pnl_percent:+.2f}", "%)` — ", REASON_LABELS.get(reason, reason),
+        ))
+
+        self._enqueue("closed", text, digest_line)
 
     async def notify_agent_activated(self, agent_name: str, symbol: str,
                                      timeframe: str, mode: str):
         """Notify when an agent is activated."""
+        self.invalidate_summaries()
+        if not self._enabled:
+            return
         text = (
             f"🚀 *Agent Activated*\n\n"
             f"*Name:* `{agent_name}`\n"
@@ -171,12 +499,15 @@ class TelegramService:
             f"*Timeframe:* `{timeframe}`\n"
             f"*Mode:* `{mode.upper()}`"
         )
-        await self.send_message(text)
+        self._send_background(text)
 
     async def notify_agent_deactivated(self, agent_name: str):
         """Notify when an agent is deactivated."""
+        self.invalidate_summaries()
+        if not self._enabled:
+            return
         text = f"⏸️ *Agent Deactivated*\n\n*Name:* `{agent_name}`"
-        await self.send_message(text)
+        self._send_background(text)
 
     async def notify_new_signal(self, sig: dict):
         """
@@ -186,88 +517,109 @@ class TelegramService:
             sig: dict with keys:
                 symbol, timeframe, is_bullish, price, actual_price, signal_time
         """
-        direction = "BULLISH ▲" if sig["is_bullish"] else "BEARISH ▼"
-        emoji = "🟢" if sig["is_bullish"] else "🔴"
-        sig_time = sig["signal_time"]
-        time_str = sig_time.strftime("%d/%m/%Y %H:%M")
-
-        text = (
-            f"{emoji} *Signal Detected*\n\n"
-            f"*Direction:* `{direction}`\n"
-            f"*Symbol:* `{sig['symbol']}`\n"
-            f"*Timeframe:* `{sig['timeframe']}`\n"
-            f"*Price:* `{sig['price']:,.2f}`\n"
-            f"*Candle:* `{time_str}`"
-        )
-
-        await self.send_message(text)
+        if not self._enabled:
+            return
+        is_bullish = sig["is_bullish"]
+        text = "".join((
+            "🟢" if is_bullish else "🔴", " *Signal Detected*",
+            "\n\n*Direction:* `", "BULLISH ▲" if is_bullish else "BEARISH ▼",
+            "`\n*Symbol:* `", sig["symbol"],
+            "`\n*Timeframe:* `", sig["timeframe"],
+            "`\n*Price:* `", f"{sig['price']:,.2f}",
+            "`\n*Candle:* `", sig["signal_time"].strftime("%d/%m/%Y %H:%M"), "`",
+        ))
+
+        self._send_background(text, is_signal=True)
 
     # ── Command handlers ─────────────────────────────────────
-    async def get_agents_summary(self, db: AsyncSession) -> str:
-        """Generate agents summary for /agents command."""
-        result = await db.execute(text("""
-            SELECT a.id, a.name, a.symbol, a.timeframe, a.is_active, a.mode,
-                   COUNT(DISTINCT CASE WHEN p.status = 'OPEN' THEN p.id END) as open_positions,
-                   COALESCE(SUM(CASE WHEN p.status = 'CLOSED' THEN p.pnl ELSE 0 END), 0) as total_pnl,
-                   COUNT(CASE WHEN p.status = 'CLOSED' AND p.pnl > 0 THEN 1 END) as wins,
-                   COUNT(CASE WHEN p.status = 'CLOSED' AND p.pnl < 0 THEN 1 END) as losses
-            FROM agents a
-            LEFT JOIN agent_positions p ON a.id = p.agent_id
-            GROUP BY a.id, a.name, a.symbol, a.timeframe, a.is_active, a.mode
-            ORDER BY a.id
-        """))
-        agents = result.fetchall()
-
+    @staticmethod
+    def _render_agents(agents) -> str:
+        """Render rows of (name, symbol, tf, active, mode, open, pnl, wins, losses)."""
         if not agents:
             return "📊 *Agents Summary*\n\nNo agents configured."
 
         lines = ["📊 *Agents Summary*\n"]
-        for row in agents:
-            id_, name, symbol, tf, active, mode, open_pos, pnl, wins, losses = row
+        for name, symbol, tf, active, mode, open_pos, pnl, wins, losses in agents:
             status = "🟢 Active" if active else "⏸️ Inactive"
-            mode_icon = "📝" if mode == "paper" else "💰"
+            mode_icon = MODE_EMOJI.get(mode, "💰")
+            wins, losses = int(wins), int(losses)
             total_trades = wins + losses
             win_rate = (wins / total_trades * 100) if total_trades > 0 else 0
 
             lines.append(
                 f"\n*{name}* {status} {mode_icon}\n"
                 f"• Symbol: `{symbol}` | TF: `{tf}`\n"
-                f"• Open: `{open_pos}` | PnL: `{pnl:+.2f}`\n"
+                f"• Open: `{int(open_pos)}` | PnL: `{pnl:+.2f}`\n"
                 f"• W/L: `{wins}/{losses}` ({win_rate:.1f}%)"
             )
-
         return "\n".join(lines)
 
-    async def get_positions_summary(self, db: AsyncSession) -> str:
-        """Generate open positions summary for /positions command."""
-        result = await db.execute(text("""
-            SELECT p.id, a.name, p.symbol, p.side, p.entry_price, 
-                   p.stop_loss, p.take_profit, p.quantity, p.opened_at
-            FROM agent_positions p
-            JOIN agents a ON p.agent_id = a.id
-            WHERE p.status = 'OPEN'
-            ORDER BY p.opened_at DESC
-        """))
-        positions = result.fetchall()
-
+    @staticmethod
+    def _render_positions(positions) -> str:
+        """Render rows of (agent, symbol, side, entry, sl, tp, qty, age_hours)."""
         if not positions:
             return "📈 *Open Positions*\n\nNo open positions."
 
         lines = ["📈 *Open Positions*\n"]
-        for row in positions:
-            id_, agent, symbol, side, entry, sl, tp, qty, opened = row
-            emoji = "🟢" if side == "LONG" else "🔴"
-            age = datetime.now(timezone.utc) - opened.replace(tzinfo=timezone.utc)
-            hours = int(age.total_seconds() / 3600)
+        for agent, symbol, side, entry, sl, tp, qty, hours in positions:
+            emoji = SIDE_EMOJI.get(side, "🔴")
 
             lines.append(
                 f"\n{emoji} *{agent}* - `{symbol}` {side}\n"
                 f"• Entry: `{entry:.2f}` | SL: `{sl:.2f}` | TP: `{tp:.2f}`\n"
                 f"• Qty: `{qty:.6f}` | Age: `{hours}h`"
             )
-
         return "\n".join(lines)
 
+    async def get_agents_summary(self, db: AsyncSession) -> str:
+        """Generate agents summary for /agents command."""
+        cached = self._get_cached_summary("agents")
+        if cached is not None:
+            return cached
+
+        stmt = _AGENTS_SUMMARY_STMTS.get(
+            db.bind.dialect.name, _AGENTS_SUMMARY_STMTS["postgresql"]
+        )
+        result = await db.execute(stmt)
+        agents = [row[1:] for row in result.fetchall()]
+        return self._store_summary("agents", self._render_agents(agents))
+
+    async def get_positions_summary(self, db: AsyncSession) -> str:
+        """Generate open positions summary for /positions command."""
+        cached = self._get_cached_summary("positions")
+        if cached is not None:
+            return cached
+
+        stmt = _OPEN_POSITIONS_STMTS.get(
+            db.bind.dialect.name, _OPEN_POSITIONS_STMTS["postgresql"]
+        )
+        result = await db.execute(stmt)
+        positions = [row[1:] for row in result.fetchall()]
+        return self._store_summary("positions", self._render_positions(positions))
+
+    async def get_status_summary(self, db: AsyncSession) -> str:
+        """Generate /status (agents + open positions) from a single query."""
+        agents_text = self._get_cached_summary("agents")
+        positions_text = self._get_cached_summary("positions")
+        if agents_text is not None and positions_text is not None:
+            return f"{agents_text}\n\n{positions_text}"
+
+        stmt = _STATUS_STMTS.get(db.bind.dialect.name, _STATUS_STMTS["postgresql"])
+        result = await db.execute(stmt)
+
+        agents, positions = [], []
+        for kind, _ord, name, symbol, label, mode, active, v1, v2, v3, v4, v5 in result:
+            if kind == "agent":
+                agents.append((name, symbol, label, active, mode, v1, v2, v3, v4))
+            else:
+                positions.append((name, symbol, label, v1, v2, v3, v4, v5))
+
+        agents_text = self._store_summary("agents", self._render_agents(agents))
+        positions_text = self._store_summary(
+            "positions", self._render_positions(positions)
+        )
+        return f"{agents_text}\n\n{positions_text}"
+
     async def get_help_text(self) -> str:
         """Generate help text for /help command."""
         return (
@@ -299,16 +651,14 @@ class TelegramService:
         if command == "/start" or command == "/help":
             return await self.get_help_text()
 
-        elif command == "/agents":
+        if command == "/agents":
             return await self.get_agents_summary(db)
 
         elif command == "/positions":
             return await self.get_positions_summary(db)
 
         elif command == "/status":
-            agents_text = await self.get_agents_summary(db)
-            positions_text = await self.get_positions_summary(db)
-            return f"{agents_text}\n\n{positions_text}"
+            return await self.get_status_summary(db)
 
         else:
             return (
@@ -317,9 +667,13 @@ class TelegramService:
             )
 
 
-# Backward-compatible singleton — delegates to centralized dependencies
+# Backward-compatible singleton — delegates to centralized dependencies.
+# The first lookup binds it as a real module global, so later accesses
+# no longer go through __getattr__.
 def __getattr__(name):
     if name == "telegram_service":
         from ..dependencies import get_telegram_service
-        return get_telegram_service()
+        service = get_telegram_service()
+        globals()["telegram_service"] = service
+        return service
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,6 +4,7 @@ Provides:
 - An async SQLite-backed database for fast isolated tests
 - An HTTPX async client wired to the FastAPI app
 - A pre-built AgentBrokerService for unit tests
+- A session-wide warm-up of the engine's JIT kernels
 """
 
 from __future__ import annotations
@@ -15,6 +16,7 @@ from typing import AsyncGenerator
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -26,6 +28,7 @@ os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
 os.environ.setdefault("DATABASE_URL_SYNC", "sqlite:///:memory:")
 os.environ.setdefault("REDIS_URL", "redis://localhost:6379/15")
 os.environ.setdefault("AUTO_REFRESH_ENABLED", "false")
+os.environ.setdefault("TELEGRAM_ENABLED", "false")
 
 from app.database import Base  # noqa: E402
 from app.main import app  # noqa: E402
@@ -54,9 +57,21 @@ _TestSessionFactory = async_sessionmaker(
 )
 
 
-@pytest_asyncio.fixture(autouse=True)
-async def setup_database():
-    """Create all tables before each test, drop after."""
+# pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy
+# emit BEGIN itself so nested transactions roll back correctly.
+@event.listens_for(_test_engine.sync_engine, "connect")
+def _sqlite_disable_autobegin(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(_test_engine.sync_engine, "begin")
+def _sqlite_emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+@pytest_asyncio.fixture(scope="session")
+async def create_schema():
+    """Create all tables once for the whole test session."""
     async with _test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
@@ -64,6 +79,28 @@ async def setup_database():
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest_asyncio.fixture(autouse=True)
+async def setup_database(create_schema):
+    """Run each test inside an outer transaction that is rolled back after.
+
+    Every session made by ``_TestSessionFactory`` joins the connection via
+    a SAVEPOINT, so ``commit()`` inside app code only releases the
+    savepoint and the final rollback leaves the schema empty again.
+    """
+    async with _test_engine.connect() as conn:
+        trans = await conn.begin()
+        _TestSessionFactory.configure(
+            bind=conn, join_transaction_mode="create_savepoint"
+        )
+        try:
+            yield
+        finally:
+            _TestSessionFactory.configure(
+                bind=_test_engine, join_transaction_mode="conservative_savepoint"
+            )
+            await trans.rollback()
+
+
 @pytest_asyncio.fixture
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     """Yield a fresh async DB session for unit tests."""
@@ -103,3 +140,35 @@ def broker_service():
     """Return an AgentBrokerService instance (stateless helper methods)."""
     from app.services.agent_broker import AgentBrokerService
     return AgentBrokerService()
+
+
+# ---------------------------------------------------------------------------
+# Engine JIT warm-up
+# ---------------------------------------------------------------------------
+@pytest.fixture(scope="session")
+def warm_engine_kernels():
+    """Compile the engine's Numba kernels once, before the first timed test.
+
+    Covers the jitted CUSUM, EMA trend, ZigZag, detector and MP kernels.
+    Opt-in (``pytest.mark.usefixtures``) so DB/API-only runs don't pay
+    for stumpy and the compiles.
+    """
+    import numpy as np
+
+    from reversal_pro.application.services.atr_service import ATRService
+    from reversal_pro.application.services.cusum_service import CUSUMService
+    from reversal_pro.application.services.ema_service import EMAService
+    from reversal_pro.application.services.matrix_profile_service import (
+        MatrixProfileService,
+    )
+    from reversal_pro.application.services.reversal_detector import ReversalDetector
+    from reversal_pro.application.services.zigzag_service import ZigZagService
+
+    closes = np.linspace(100.0, 110.0, 40)
+    highs, lows = closes + 1.0, closes - 1.0
+    atr = ATRService.atr(highs, lows, closes, 5)  # input data only
+    CUSUMService().compute_reduction(closes, atr)
+    EMAService.compute_trend(closes, highs, lows)
+    ZigZagService().compute_preview_pivots(highs, lows, atr)
+    ReversalDetector().detect([], len(closes), highs, lows)
+    MatrixProfileService.warmup()
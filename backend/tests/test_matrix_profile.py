@@ -19,11 +19,14 @@ from reversal_pro.application.services.matrix_profile_service import (
     MatrixProfileService,
     MatrixProfileResult,
     RegimeChangePoint,
+    clear_result_cache,
 )
 from reversal_pro.application.use_cases.detect_reversals import DetectReversalsUseCase
 from reversal_pro.domain.enums import SignalMode, SensitivityPreset, CalculationMethod
 from reversal_pro.domain.value_objects import OHLCVBar
 
+pytestmark = pytest.mark.usefixtures("warm_engine_kernels")
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -38,26 +41,61 @@ def _make_trending_then_reversing(n: int = 200, noise: float = 0.5) -> np.ndarra
     """
     rng = np.random.default_rng(42)
     half = n // 2
-    up = np.cumsum(rng.normal(1.0, noise, half)) + 100
-    down = np.cumsum(rng.normal(-1.0, noise, n - half)) + up[-1]
-    return np.concatenate([up, down])
+    # Fill both halves in place in a single buffer.  standard_normal * noise
+    # + mean draws the same stream as rng.normal(mean, noise).
+    out = np.empty(n)
+    up, down = out[:half], out[half:]
+    rng.standard_normal(out=up)
+    up *= noise
+    up += 1.0
+    np.cumsum(up, out=up)
+    up += 100
+    rng.standard_normal(out=down)
+    down *= noise
+    down -= 1.0
+    np.cumsum(down, out=down)
+    down += up[-1]
+    return out
 
 
 def _closes_to_bars(closes: np.ndarray) -> list[OHLCVBar]:
     """Convert a close array to minimal OHLCVBar list (O=H=L=C with spread)."""
-    bars = []
-    for i, c in enumerate(closes):
-        h = c * 1.002
-        l = c * 0.998
-        bars.append(OHLCVBar(
-            timestamp=i,
-            open=c,
-            high=h,
-            low=l,
-            close=c,
-            volume=1000.0,
-        ))
-    return bars
+    highs = (closes * 1.002).tolist()
+    lows = (closes * 0.998).tolist()
+    return [
+        OHLCVBar(timestamp=i, open=c, high=h, low=l, close=c, volume=1000.0)
+        for i, (c, h, l) in enumerate(zip(closes.tolist(), highs, lows))
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Fixtures — the series are seeded and never mutated, so build them once
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def closes_200() -> np.ndarray:
+    return _make_trending_then_reversing(200)
+
+
+@pytest.fixture(scope="module")
+def closes_300() -> np.ndarray:
+    return _make_trending_then_reversing(300)
+
+
+@pytest.fixture(scope="module")
+def bars_200(closes_200) -> list[OHLCVBar]:
+    return _closes_to_bars(closes_200)
+
+
+@pytest.fixture(scope="module")
+def bars_300(closes_300) -> list[OHLCVBar]:
+    return _closes_to_bars(closes_300)
+
+
+@pytest.fixture(scope="module")
+def flat_closes_200() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return np.full(200, 100.0) + rng.normal(0, 1e-4, 200)
 
 
 # ---------------------------------------------------------------------------
@@ -66,45 +104,42 @@ def _closes_to_bars(closes: np.ndarray) -> list[OHLCVBar]:
 
 class TestMatrixProfileService:
 
-    def test_basic_analysis_returns_valid_result(self):
+    def test_basic_analysis_returns_valid_result(self, closes_200):
         """Service returns a well-formed MatrixProfileResult."""
-        closes = _make_trending_then_reversing(200)
         svc = MatrixProfileService(
             subsequence_length=10,
             z_threshold=1.8,
             timeframe="1h",
         )
-        result = svc.analyze(closes)
+        result = svc.analyze(closes_200)
 
         assert isinstance(result, MatrixProfileResult)
         assert result.novelty_scores.shape == (200,)
         assert result.threshold_reduction.shape == (200,)
         assert result.threshold == 1.8
 
-    def test_threshold_reduction_in_range(self):
+    def test_threshold_reduction_in_range(self, closes_200):
         """All reduction values must be in [min_reduction, 1.0]."""
-        closes = _make_trending_then_reversing(200)
         svc = MatrixProfileService(
             subsequence_length=10,
             min_reduction=0.40,
             timeframe="1h",
         )
-        result = svc.analyze(closes)
+        result = svc.analyze(closes_200)
 
         valid = result.threshold_reduction[~np.isnan(result.threshold_reduction)]
         assert np.all(valid >= 0.40 - 1e-9)
         assert np.all(valid <= 1.0 + 1e-9)
 
-    def test_detects_regime_change_in_synthetic(self):
+    def test_detects_regime_change_in_synthetic(self, closes_200):
         """At least one change point should be detected near the midpoint."""
-        closes = _make_trending_then_reversing(200)
         svc = MatrixProfileService(
             subsequence_length=10,
             z_threshold=1.5,  # slightly lower to ensure detection
             rolling_window=20,
             timeframe="1h",
         )
-        result = svc.analyze(closes)
+        result = svc.analyze(closes_200)
 
         # There should be at least one change point
         assert len(result.change_points) >= 1, (
@@ -131,51 +166,47 @@ class TestMatrixProfileService:
         assert len(result.change_points) == 0
         assert np.all(result.threshold_reduction == 1.0)
 
-    def test_flat_series_fewer_change_points_than_trending(self):
+    def test_flat_series_fewer_change_points_than_trending(
+        self, flat_closes_200, closes_200,
+    ):
         """A flat series should produce fewer change points than a trending one."""
-        rng = np.random.default_rng(0)
-        flat_closes = np.full(200, 100.0) + rng.normal(0, 1e-4, 200)
-        trending_closes = _make_trending_then_reversing(200)
-
         svc = MatrixProfileService(
             subsequence_length=10,
             z_threshold=1.8,
             timeframe="1h",
         )
 
-        flat_result = svc.analyze(flat_closes)
-        trend_result = svc.analyze(trending_closes)
+        flat_result = svc.analyze(flat_closes_200)
+        trend_result = svc.analyze(closes_200)
 
         # The trending series should have at least as many change points
         # as the flat one (ideally more, due to the actual regime change)
         assert len(trend_result.change_points) >= len(flat_result.change_points)
 
-    def test_change_points_have_valid_scores(self):
+    def test_change_points_have_valid_scores(self, closes_200):
         """All change-point scores should be above the threshold."""
-        closes = _make_trending_then_reversing(200)
         threshold = 1.5
         svc = MatrixProfileService(
             subsequence_length=10,
             z_threshold=threshold,
             timeframe="1h",
         )
-        result = svc.analyze(closes)
+        result = svc.analyze(closes_200)
 
         for cp in result.change_points:
             assert cp.score >= threshold
             assert cp.is_significant is True
             assert 0 <= cp.bar_index < 200
 
-    def test_reduction_decays_over_time(self):
+    def test_reduction_decays_over_time(self, closes_200):
         """After a change point, reduction should increase back to 1.0."""
-        closes = _make_trending_then_reversing(200)
         svc = MatrixProfileService(
             subsequence_length=10,
             z_threshold=1.5,
             score_decay_bars=6,
             timeframe="1h",
         )
-        result = svc.analyze(closes)
+        result = svc.analyze(closes_200)
 
         if result.change_points:
             cp = result.change_points[0]
@@ -186,6 +217,86 @@ class TestMatrixProfileService:
                     <= result.threshold_reduction[cp.bar_index + 6]
                 )
 
+    def test_rolling_z_score_matches_windowed_reference(self):
+        """Cumulative-sum rolling Z-score equals the per-window definition."""
+        arr = np.abs(np.random.default_rng(0).normal(3.0, 1.0, 300))
+        window = 20
+        expected = np.zeros(len(arr))
+        for i in range(len(arr)):
+            chunk = arr[max(0, i - window + 1):i + 1]
+            if chunk.std() > 1e-10:
+                expected[i] = (arr[i] - chunk.mean()) / chunk.std()
+
+        result = MatrixProfileService._rolling_z_score(arr, window)
+
+        np.testing.assert_allclose(result, expected, atol=1e-9)
+
+    def test_rolling_z_score_is_stable_on_large_offset(self):
+        """Running sums must not lose the spread of distances near 1e4."""
+        arr = 1e4 + np.random.default_rng(1).normal(3.0, 1e-3, 300)
+        arr[100:130] = 1e4 + 3.0  # flat stretch → Z must be exactly 0
+        window = 20
+
+        result = MatrixProfileService._rolling_z_score(arr, window)
+
+        ref_i = 250
+        chunk = arr[ref_i - window + 1:ref_i + 1]
+        assert result[ref_i] == pytest.approx(
+            (arr[ref_i] - chunk.mean()) / chunk.std(), abs=1e-6
+        )
+        assert np.all(result[100 + window - 1:130] == 0.0)
+
+    def test_repeated_analysis_is_served_from_cache(self, closes_200):
+        """Same closes + params → the cached result object is returned."""
+        clear_result_cache()
+        first = MatrixProfileService(subsequence_length=10).analyze(closes_200)
+        second = MatrixProfileService(subsequence_length=10).analyze(closes_200.copy())
+        other = MatrixProfileService(subsequence_length=12).analyze(closes_200)
+
+        assert second is first
+        assert other is not first
+        assert not first.threshold_reduction.flags.writeable
+
+    def test_gpu_failure_falls_back_to_cpu(self, closes_200, monkeypatch):
+        """A failing gpu_stump must not lose the analysis."""
+        import stumpy
+        from reversal_pro.application.services import matrix_profile_service as mps
+
+        def _broken_gpu_stump(ts, m):
+            raise RuntimeError("no device")
+
+        clear_result_cache()
+        expected = MatrixProfileService(subsequence_length=10, use_gpu=False).analyze(closes_200)
+        clear_result_cache()
+        monkeypatch.setattr(mps, "_cuda_available", lambda: True)
+        monkeypatch.setattr(stumpy, "gpu_stump", _broken_gpu_stump)
+        result = MatrixProfileService(subsequence_length=10, use_gpu=True).analyze(closes_200)
+        clear_result_cache()
+
+        np.testing.assert_array_equal(result.novelty_scores, expected.novelty_scores)
+
+    def test_streaming_matches_full_recompute(self, closes_200):
+        """Appending bars through stumpi gives the full-join result."""
+        clear_result_cache()
+        full = MatrixProfileService(subsequence_length=10).analyze(closes_200)
+
+        svc = MatrixProfileService(subsequence_length=10, streaming=True)
+        svc.analyze(closes_200[:190])
+        for close in closes_200[190:]:
+            result = svc.analyze_incremental(close)
+        clear_result_cache()
+
+        np.testing.assert_allclose(
+            result.novelty_scores, full.novelty_scores, atol=1e-9, equal_nan=True,
+        )
+        assert [cp.bar_index for cp in result.change_points] == [
+            cp.bar_index for cp in full.change_points
+        ]
+
+    def test_streaming_requires_returns(self):
+        with pytest.raises(ValueError):
+            MatrixProfileService(streaming=True, use_returns=False)
+
 
 # ---------------------------------------------------------------------------
 # Integration with DetectReversalsUseCase
@@ -193,47 +304,38 @@ class TestMatrixProfileService:
 
 class TestDetectReversalsWithMP:
 
-    def test_use_case_runs_with_mp_enabled(self):
+    def test_use_case_runs_with_mp_enabled(self, bars_200):
         """The full pipeline should execute without error when MP is on."""
-        closes = _make_trending_then_reversing(200)
-        bars = _closes_to_bars(closes)
-
         uc = DetectReversalsUseCase(
             signal_mode=SignalMode.CONFIRMED_ONLY,
             sensitivity=SensitivityPreset.MEDIUM,
             use_matrix_profile=True,
             timeframe="1h",
         )
-        result = uc.execute(bars)
+        result = uc.execute(bars_200)
 
         assert result.mp_enabled is True
         assert isinstance(result.regime_change_signals, list)
 
-    def test_use_case_runs_with_mp_disabled(self):
+    def test_use_case_runs_with_mp_disabled(self, bars_200):
         """Pipeline works normally when MP is explicitly disabled."""
-        closes = _make_trending_then_reversing(200)
-        bars = _closes_to_bars(closes)
-
         uc = DetectReversalsUseCase(
             signal_mode=SignalMode.CONFIRMED_ONLY,
             sensitivity=SensitivityPreset.MEDIUM,
             use_matrix_profile=False,
             timeframe="1h",
         )
-        result = uc.execute(bars)
+        result = uc.execute(bars_200)
 
         assert result.mp_enabled is False
         assert result.regime_change_signals == []
 
-    def test_mp_reduces_detection_latency(self):
+    def test_mp_reduces_detection_latency(self, bars_300):
         """
         With MP enabled, reversals should be detected earlier (or at the
         same time) compared to MP disabled, because the threshold is reduced
         near regime changes.
         """
-        closes = _make_trending_then_reversing(300)
-        bars = _closes_to_bars(closes)
-
         # Without MP
         uc_no_mp = DetectReversalsUseCase(
             signal_mode=SignalMode.CONFIRMED_ONLY,
@@ -241,7 +343,7 @@ class TestDetectReversalsWithMP:
             use_matrix_profile=False,
             timeframe="1h",
         )
-        result_no_mp = uc_no_mp.execute(bars)
+        result_no_mp = uc_no_mp.execute(bars_300)
 
         # With MP
         uc_mp = DetectReversalsUseCase(
@@ -252,7 +354,7 @@ class TestDetectReversalsWithMP:
             mp_min_reduction=0.40,
             timeframe="1h",
         )
-        result_mp = uc_mp.execute(bars)
+        result_mp = uc_mp.execute(bars_300)
 
         assert result_mp.mp_enabled is True
 
@@ -273,11 +375,8 @@ class TestDetectReversalsWithMP:
                     f"non-MP detection ({first_no_mp})"
                 )
 
-    def test_result_contains_regime_change_signals(self):
+    def test_result_contains_regime_change_signals(self, bars_200):
         """Regime change signals should have valid fields."""
-        closes = _make_trending_then_reversing(200)
-        bars = _closes_to_bars(closes)
-
         uc = DetectReversalsUseCase(
             signal_mode=SignalMode.CONFIRMED_ONLY,
             sensitivity=SensitivityPreset.MEDIUM,
@@ -285,7 +384,7 @@ class TestDetectReversalsWithMP:
             mp_cac_threshold=1.5,
             timeframe="1h",
         )
-        result = uc.execute(bars)
+        result = uc.execute(bars_200)
 
         for rcs in result.regime_change_signals:
             assert 0 <= rcs.bar_index < 200
@@ -0,0 +1,294 @@
+"""Unit tests for TelegramService command rendering and summary caching.
+
+Uses the in-memory SQLite DB from conftest; Telegram itself stays disabled
+so no message ever leaves the process.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import orjson
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Agent, AgentPosition
+from app.services import telegram_service as telegram_module
+from app.services.telegram_service import TelegramService
+
+
+async def _add_agent(db: AsyncSession, name: str = "tg_agent") -> Agent:
+    agent = Agent(name=name, symbol="BTC/USDT", timeframe="1h", mode="paper")
+    db.add(agent)
+    await db.commit()
+    await db.refresh(agent)
+    return agent
+
+
+@pytest.mark.asyncio
+class TestSummaryCache:
+
+    async def test_agents_summary_lists_agents(self, db_session: AsyncSession):
+        await _add_agent(db_session)
+        svc = TelegramService()
+
+        summary = await svc.get_agents_summary(db_session)
+
+        assert "tg_agent" in summary
+        assert "W/L: `0/0`" in summary
+
+    async def test_agents_summary_is_cached(self, db_session: AsyncSession):
+        svc = TelegramService()
+        first = await svc.get_agents_summary(db_session)
+
+        await _add_agent(db_session, "added_later")
+        second = await svc.get_agents_summary(db_session)
+
+        assert second == first
+        assert "added_later" not in second
+
+    async def test_invalidate_refreshes_summary(self, db_session: AsyncSession):
+        svc = TelegramService()
+        await svc.get_agents_summary(db_session)
+
+        await _add_agent(db_session, "added_later")
+        svc.invalidate_summaries()
+        summary = await svc.get_agents_summary(db_session)
+
+        assert "added_later" in summary
+
+    async def test_agents_summary_aggregates_positions(self, db_session: AsyncSession):
+        agent = await _add_agent(db_session)
+        for status, pnl in (("OPEN", None), ("CLOSED", 5.0), ("CLOSED", -2.0),
+                            ("CLOSED", 3.0), ("STOPPED", -50.0)):
+            db_session.add(AgentPosition(
+                agent_id=agent.id, symbol="BTC/USDT", side="LONG", status=status,
+                entry_price=100.0, stop_loss=95.0, take_profit=110.0,
+                quantity=0.5, pnl=pnl,
+            ))
+        await db_session.commit()
+        svc = TelegramService()
+
+        summary = await svc.get_agents_summary(db_session)
+
+        assert "Open: `1` | PnL: `+6.00`" in summary
+        assert "W/L: `2/1` (66.7%)" in summary
+
+    async def test_positions_summary_reports_age(self, db_session: AsyncSession):
+        agent = await _add_agent(db_session)
+        db_session.add(AgentPosition(
+            agent_id=agent.id, symbol="BTC/USDT", side="LONG",
+            entry_price=100.0, stop_loss=95.0, take_profit=110.0, quantity=0.5,
+            opened_at=datetime.now(timezone.utc) - timedelta(hours=5, minutes=10),
+        ))
+        await db_session.commit()
+        svc = TelegramService()
+
+        summary = await svc.get_positions_summary(db_session)
+
+        assert "🟢 *tg_agent* - `BTC/USDT` LONG" in summary
+        assert "Age: `5h`" in summary
+
+    async def test_positions_summary_truncates_partial_hours(self, db_session: AsyncSession):
+        agent = await _add_agent(db_session)
+        db_session.add(AgentPosition(
+            agent_id=agent.id, symbol="BTC/USDT", side="SHORT",
+            entry_price=100.0, stop_loss=105.0, take_profit=90.0, quantity=0.5,
+            opened_at=datetime.now(timezone.utc) - timedelta(hours=1, minutes=40),
+        ))
+        await db_session.commit()
+        svc = TelegramService()
+
+        summary = await svc.get_positions_summary(db_session)
+
+        assert "Age: `1h`" in summary
+
+    async def test_status_matches_individual_summaries(self, db_session: AsyncSession):
+        agent = await _add_agent(db_session)
+        await _add_agent(db_session, "idle_agent")
+        for hours, status, pnl in ((1, "OPEN", None), (3, "OPEN", None), (9, "CLOSED", 4.0)):
+            db_session.add(AgentPosition(
+                agent_id=agent.id, symbol="BTC/USDT", side="SHORT", status=status,
+                entry_price=100.0, stop_loss=105.0, take_profit=90.0,
+                quantity=0.5, pnl=pnl,
+                opened_at=datetime.now(timezone.utc) - timedelta(hours=hours, minutes=5),
+            ))
+        await db_session.commit()
+
+        status = await TelegramService().process_command(db_session, "/status")
+        expected = "\n\n".join((
+            await TelegramService().get_agents_summary(db_session),
+            await TelegramService().get_positions_summary(db_session),
+        ))
+
+        assert status == expected
+        assert status.index("Age: `1h`") < status.index("Age: `3h`")
+
+    async def test_breakeven_refreshes_positions_summary(
+        self, db_session: AsyncSession, broker_service
+    ):
+        agent = await _add_agent(db_session)
+        pos = AgentPosition(
+            agent_id=agent.id, symbol="BTC/USDT", side="LONG",
+            entry_price=100.0, stop_loss=95.0, take_profit=110.0, quantity=0.5,
+        )
+        db_session.add(pos)
+        await db_session.commit()
+        svc = telegram_module.telegram_service
+        svc.invalidate_summaries()
+        assert "SL: `95.00`" in await svc.get_positions_summary(db_session)
+
+        assert await broker_service._check_breakeven(db_session, agent, pos, 106.0)
+
+        assert "SL: `100.00`" in await svc.process_command(db_session, "/positions")
+
+    async def test_status_command_served_from_cache(self, db_session: AsyncSession):
+        svc = TelegramService()
+        first = await svc.process_command(db_session, "/status")
+        second = await svc.process_command(db_session, " /STATUS ")
+
+        assert second == first
+        assert svc.cache_info()["hits"] >= 1
+
+
+@pytest.mark.asyncio
+class TestNotificationRendering:
+
+    @pytest.fixture
+    def sent(self, monkeypatch):
+        messages = []
+
+        async def _capture(self, text, parse_mode="Markdown"):
+            messages.append(text)
+            return True
+
+        monkeypatch.setattr(TelegramService, "send_message", _capture)
+        return messages
+
+    @pytest.fixture
+    async def svc(self):
+        service = TelegramService()
+        service._enabled = True
+        service.coalesce_window = 0.01
+        yield service
+        await service.close()
+
+    async def test_position_closed_message(self, svc, sent):
+        await svc.notify_position_closed(
+            "agent_1", "BTC/USDT", "LONG", 100.0, 110.0,
+            12.5, 10.0, "TAKE_PROFIT", "paper",
+        )
+        await svc.flush()
+
+        assert sent == [
+            "✅ *Position Closed* 📝\n\n"
+            "*Agent:* `agent_1`\n"
+            "*Symbol:* `BTC/USDT`\n"
+            "*Side:* `LONG`\n"
+            "*Entry:* `100.00`\n"
+            "*Exit:* `110.00`\n"
+            "*PnL:* `+12.50 (+10.00%)`\n"
+            "*Reason:* `Take Profit`\n"
+            "*Mode:* `PAPER`"
+        ]
+
+    async def test_position_opened_message(self, svc, sent):
+        await svc.notify_position_opened(
+            "agent_1", "BTC/USDT", "SHORT", 100.0, 105.0, 90.0, 0.25, "live",
+        )
+        await svc.flush()
+
+        assert sent[0].startswith("🔴 *Position Opened* 💰\n\n")
+        assert "*R:R Ratio:* `2.00`" in sent[0]
+        assert sent[0].endswith("*Mode:* `LIVE`")
+
+    async def test_burst_is_coalesced_into_digest(self, svc, sent):
+        for i in range(3):
+            await svc.notify_position_opened(
+                f"agent_{i}", "BTC/USDT", "LONG", 100.0, 95.0, 110.0, 0.1, "paper",
+            )
+        await svc.notify_position_closed(
+            "agent_9", "ETH/USDT", "SHORT", 50.0, 55.0,
+            -5.0, -10.0, "STOP_LOSS", "paper",
+        )
+        await svc.flush()
+
+        assert len(sent) == 2
+        assert sent[0].startswith("🟢 *3 Positions Opened*\n\n")
+        assert sent[0].count("\n• ") == 3
+        assert sent[1].startswith("❌ *Position Closed*")
+
+    async def test_agent_notification_sent_in_background(self, svc, sent):
+        await svc.notify_agent_deactivated("agent_1")
+        await svc.flush()
+
+        assert sent == ["⏸️ *Agent Deactivated*\n\n*Name:* `agent_1`"]
+
+    async def test_close_waits_for_background_sends(self, monkeypatch):
+        async def _post(self, text, parse_mode="Markdown"):
+            await asyncio.sleep(0.01)
+            await self._get_client()
+            return True
+
+        monkeypatch.setattr(TelegramService, "send_message", _post)
+        svc = TelegramService()
+        svc._enabled = True
+        svc._send_background("🟢 *signal*", is_signal=True)
+        tasks = set(svc._fire_and_forget)
+
+        await svc.close()
+
+        assert all(t.done() for t in tasks)
+        assert svc._client is None
+
+    async def test_disabled_service_skips_rendering(self, sent):
+        svc = TelegramService()
+        svc._enabled = False
+        await svc.notify_position_opened(
+            "agent_1", "BTC/USDT", "LONG", 100.0, 95.0, 110.0, 0.1, "paper",
+        )
+        await svc.notify_agent_deactivated("agent_1")
+
+        assert svc._outbox is None
+        assert not svc._fire_and_forget
+        assert sent == []
+
+    async def test_full_backlog_drops_signals_first(self, svc, sent, monkeypatch):
+        monkeypatch.setattr(telegram_module, "MAX_PENDING_SENDS", 1)
+        sig = {
+            "symbol": "BTC/USDT", "timeframe": "1h", "is_bullish": True,
+            "price": 100.0, "signal_time": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        }
+        await svc.notify_new_signal(sig)
+        await svc.notify_agent_deactivated("agent_1")
+        await svc.notify_new_signal(sig)
+        await svc.flush()
+
+        assert sent == ["⏸️ *Agent Deactivated*\n\n*Name:* `agent_1`"]
+
+
+@pytest.mark.asyncio
+async def test_send_message_posts_orjson_body():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"ok": True})
+
+    svc = TelegramService()
+    svc._enabled = True
+    svc._chat_id = "42"
+    svc._base_url = "https://api.telegram.org/botTOKEN"
+    svc._client = httpx.AsyncClient(
+        base_url=svc._base_url,
+        headers={"Content-Type": "application/json"},
+        transport=httpx.MockTransport(handler),
+    )
+
+    assert await svc.send_message("🟢 *hi*") is True
+    await svc.close()
+
+    request = requests[0]
+    assert request.url == "https://api.telegram.org/botTOKEN/sendMessage"
+    assert request.headers["Content-Type"] == "application/json"
+    assert orjson.loads(request.content)["text"] == "🟢 *hi*"
@@ -1,16 +1,30 @@
-import requests
+import asyncio
+
+import httpx
+
 API = 'http://176.131.66.167:8080'
-for tf in ['1m', '5m', '15m', '1h']:
-    r = requests.get(f'{API}/api/analysis/chart/BTC-USDT/{tf}', params={
-        'limit': 500, 'sensitivity': 'Medium', 'signal_mode': 'Confirmed Only'
-    }, timeout=30)
-    if r.status_code == 200:
-        d = r.json()
-        candles = len(d.get('candles', []))
-        signals = len(d.get('markers', []))
-        atr = d.get('current_atr', 0)
-        thr = d.get('threshold', 0)
-        mult = d.get('atr_multiplier', 0)
-        print(f"{tf}: {candles} candles, {signals} signals, ATR={atr:.2f}, mult={mult}, threshold={thr:.2f}")
-    else:
-        print(f"{tf}: Error {r.status_code} - {r.text[:100]}")
+TIMEFRAMES = ['1m', '5m', '15m', '1h']
+PARAMS = {'limit': 500, 'sensitivity': 'Medium', 'signal_mode': 'Confirmed Only'}
+
+
+async def main():
+    async with httpx.AsyncClient(base_url=API, timeout=30) as client:
+        responses = await asyncio.gather(*[
+            client.get(f'/api/analysis/chart/BTC-USDT/{tf}', params=PARAMS)
+            for tf in TIMEFRAMES
+        ])
+
+    for tf, r in zip(TIMEFRAMES, responses):
+        if r.status_code == 200:
+            d = r.json()
+            candles = len(d.get('candles', []))
+            signals = len(d.get('markers', []))
+            atr = d.get('current_atr', 0)
+            thr = d.get('threshold', 0)
+            mult = d.get('atr_multiplier', 0)
+            print(f"{tf}: {candles} candles, {signals} signals, ATR={atr:.2f}, mult={mult}, threshold={thr:.2f}")
+        else:
+            print(f"{tf}: Error {r.status_code} - {r.text[:100]}")
+
+
+asyncio.run(main())
@@ -190,6 +190,7 @@ CREATE TABLE IF NOT EXISTS agent_positions (
 CREATE INDEX IF NOT EXISTS idx_positions_agent ON agent_positions (agent_id, status);
 CREATE INDEX IF NOT EXISTS idx_positions_status ON agent_positions (status);
 CREATE INDEX IF NOT EXISTS idx_positions_symbol ON agent_positions (symbol);
+CREATE INDEX IF NOT EXISTS idx_positions_open_opened ON agent_positions (status, opened_at DESC) WHERE status = 'OPEN';
 
 -- ============================================================================
 -- Agent Activity Logs
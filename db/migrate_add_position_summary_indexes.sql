@@ -0,0 +1,9 @@
+-- ============================================================================
+-- Index backing the Telegram /positions and /status summaries
+-- ============================================================================
+
+-- Newest open positions first (/positions) — index order replaces the sort.
+-- The /agents aggregation is already served by idx_positions_agent.
+CREATE INDEX IF NOT EXISTS idx_positions_open_opened
+    ON agent_positions (status, opened_at DESC)
+    WHERE status = 'OPEN';
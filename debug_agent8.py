@@ -1,10 +1,25 @@
-import requests, json
+import asyncio
+import json
 from datetime import datetime
 
+import httpx
+
 BASE = "http://176.131.66.167:8080/api"
 
-# Correct endpoint with agent 8 settings (sensitivity=Low, signal_mode=Confirmed Only)
-r = requests.get(f"{BASE}/analysis/chart/BTC-USDT/5m?limit=500&sensitivity=Low&signal_mode=Confirmed+Only")
+
+async def fetch_all():
+    """Fetch the chart and the stored signals concurrently."""
+    async with httpx.AsyncClient(base_url=BASE, timeout=30) as client:
+        return await asyncio.gather(
+            # Correct endpoint with agent 8 settings (sensitivity=Low, signal_mode=Confirmed Only)
+            client.get("/analysis/chart/BTC-USDT/5m", params={
+                "limit": 500, "sensitivity": "Low", "signal_mode": "Confirmed Only",
+            }),
+            client.get("/analysis/signals/BTC-USDT/5m"),
+        )
+
+
+r, r2 = asyncio.run(fetch_all())
 print("Status:", r.status_code)
 data = r.json()
 print("Keys:", list(data.keys()))
@@ -44,7 +59,6 @@ for m in markers:
 
 # Stored signals from DB
 print("\n=== Stored signals from DB ===")
-r2 = requests.get(f"{BASE}/analysis/signals/BTC-USDT/5m")
 print("Signals status:", r2.status_code)
 sigs = r2.json()
 if isinstance(sigs, list):
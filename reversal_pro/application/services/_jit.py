@@ -0,0 +1,30 @@
+"""Optional Numba JIT support for the engine's scalar kernels.
+
+Numba ships with the engine (it is pulled in by stumpy as well), but the
+kernels must still import and run without it — e.g. on platforms without
+an LLVM wheel.  When Numba is missing, ``njit`` and ``prange`` degrade to
+the identity decorator and ``range`` so the same code runs as plain Python.
+"""
+
+from __future__ import annotations
+
+try:
+    from numba import njit, prange
+
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for ``numba.njit`` (bare or with options)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+__all__ = ["HAVE_NUMBA", "njit", "prange"]
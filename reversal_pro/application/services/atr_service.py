@@ -1,7 +1,43 @@
 """ATR (Average True Range) calculation service."""
 
 import numpy as np
-from typing import List
+from typing import List, Optional
+from scipy.signal import lfilter
+
+from .bar_features import BarFeatures
+
+
+class ATRStateful:
+    """
+    Incremental ATR for live bars.
+
+    Feed each bar's True Range (``BarFeatures.tr``) to :meth:`update`.  The
+    first ``period`` values are kept for the SMA seed; after that each bar
+    is one step of the same seeded ``lfilter`` :meth:`ATRService.atr` runs,
+    so values match the batch output bar for bar.
+    """
+
+    def __init__(self, period: int = 5):
+        self.period = period
+        self.value = np.nan  # NaN until `period` bars have been seen
+        self._decay = (period - 1) / period
+        self._b = np.array([1.0 / period])
+        self._a = np.array([1.0, -self._decay])
+        self._seed: List[float] = []
+
+    def update(self, tr: float) -> float:
+        """Feed one bar's True Range and return its ATR."""
+        if self.value == self.value:  # seeded (not NaN)
+            self.value = float(lfilter(
+                self._b, self._a, np.array([tr], dtype=np.float64),
+                zi=[self.value * self._decay],
+            )[0][0])
+        else:
+            self._seed.append(tr)
+            if len(self._seed) == self.period:
+                self.value = float(np.mean(self._seed))
+                self._seed = []
+        return self.value
 
 
 class ATRService:
@@ -15,16 +51,21 @@ class ATRService:
         Compute True Range for each bar.
         TR = max(high - low, |high - prev_close|, |low - prev_close|)
         """
-        n = len(highs)
-        tr = np.zeros(n)
-        tr[0] = highs[0] - lows[0]
-
-        for i in range(1, n):
-            hl = highs[i] - lows[i]
-            hpc = abs(highs[i] - closes[i - 1])
-            lpc = abs(lows[i] - closes[i - 1])
-            tr[i] = max(hl, hpc, lpc)
+        highs = np.asarray(highs, dtype=np.float64)
+        lows = np.asarray(lows, dtype=np.float64)
+        closes = np.asarray(closes, dtype=np.float64)
+        if len(highs) == 0:
+            return np.zeros(0)
 
+        # Bar 0 has no previous close: TR is just its range.  The rest is
+        # three SIMD ufunc passes reusing two buffers, no Python-level max.
+        tr = np.subtract(highs, lows)
+        gap = np.subtract(highs[1:], closes[:-1])
+        np.abs(gap, out=gap)
+        np.maximum(tr[1:], gap, out=tr[1:])
+        np.subtract(lows[1:], closes[:-1], out=gap)
+        np.abs(gap, out=gap)
+        np.maximum(tr[1:], gap, out=tr[1:])
         return tr
 
     @staticmethod
@@ -33,12 +74,17 @@ class ATRService:
         lows: np.ndarray,
         closes: np.ndarray,
         period: int = 5,
+        features: Optional[BarFeatures] = None,
     ) -> np.ndarray:
         """
         Compute ATR using a simple moving average of True Range.
         Returns an array of ATR values (NaN for the first `period - 1` bars).
+        Pass pre-computed ``features`` to reuse their True Range.
         """
-        tr = ATRService.true_range(highs, lows, closes)
+        if features is not None:
+            tr = features.tr
+        else:
+            tr = ATRService.true_range(highs, lows, closes)
         n = len(tr)
         atr_values = np.full(n, np.nan)
 
@@ -46,13 +92,16 @@ class ATRService:
             return atr_values
 
         # Initial SMA
-        atr_values[period - 1] = np.mean(tr[:period])
+        seed = np.mean(tr[:period])
+        atr_values[period - 1] = seed
 
-        # Wilder's smoothing (RMA)
-        for i in range(period, n):
-            atr_values[i] = (
-                atr_values[i - 1] * (period - 1) + tr[i]
-            ) / period
+        # Wilder's smoothing (RMA): atr[i] = atr[i-1] * (p-1)/p + tr[i] / p,
+        # a first-order IIR filter seeded with the SMA.
+        if n > period:
+            decay = (period - 1) / period
+            atr_values[period:] = lfilter(
+                [1.0 / period], [1.0, -decay], tr[period:], zi=[seed * decay]
+            )[0]
 
         return atr_values
 
@@ -74,3 +123,24 @@ class ATRService:
         pct_amount = close * percent_threshold / 100
         atr_amount = atr_multiplier * atr_value
         return max(pct_amount, max(absolute_reversal, atr_amount))
+
+    @staticmethod
+    def compute_reversal_thresholds(
+        closes: np.ndarray,
+        percent_threshold: float,
+        absolute_reversal: float,
+        atr_multiplier: float,
+        atr_values: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Array form of :meth:`compute_reversal_threshold` for every bar.
+        NaN ATR (warm-up bars) counts as 0, leaving the percent and
+        absolute floors in charge.
+        """
+        thresholds = np.nan_to_num(atr_values, nan=0.0)
+        thresholds *= atr_multiplier
+        np.maximum(thresholds, absolute_reversal, out=thresholds)
+        pct_amounts = closes * percent_threshold
+        pct_amounts /= 100.0
+        np.maximum(pct_amounts, thresholds, out=thresholds)
+        return thresholds
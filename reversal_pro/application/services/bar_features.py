@@ -0,0 +1,70 @@
+"""
+Per-bar geometric features shared by the threshold services.
+
+ATR, candle-pattern detection and the use case all derive the same
+quantities (previous close, range, body, shadows, true range) from the
+OHLC arrays.  ``compute_bar_features`` builds them once per analysis as
+a struct-of-arrays so every consumer reads the same contiguous arrays
+instead of recomputing them.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class BarFeatures:
+    """Struct-of-arrays of per-bar features, all of shape (n,)."""
+    prev_close: np.ndarray    # close of the previous bar (bar 0: its own close)
+    full_range: np.ndarray    # high - low
+    hpc: np.ndarray           # |high - prev_close|
+    lpc: np.ndarray           # |low - prev_close|
+    tr: np.ndarray            # True Range (bar 0: high - low)
+    body_signed: np.ndarray   # close - open
+    body: np.ndarray          # |close - open|
+    ratio: np.ndarray         # body / range (0 where the range is ~0)
+    lower_shadow: np.ndarray  # min(open, close) - low
+    upper_shadow: np.ndarray  # high - max(open, close)
+
+
+def compute_bar_features(
+    opens: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+) -> BarFeatures:
+    """Compute every per-bar feature in one set of vectorized passes."""
+    opens = np.asarray(opens, dtype=np.float64)
+    highs = np.asarray(highs, dtype=np.float64)
+    lows = np.asarray(lows, dtype=np.float64)
+    closes = np.asarray(closes, dtype=np.float64)
+
+    prev_close = np.concatenate((closes[:1], closes[:-1]))
+    full_range = highs - lows
+    hpc = np.abs(highs - prev_close)
+    lpc = np.abs(lows - prev_close)
+    tr = np.maximum(full_range, np.maximum(hpc, lpc))
+    if len(tr):
+        tr[0] = full_range[0]
+
+    body_signed = closes - opens
+    body = np.abs(body_signed)
+    ratio = np.divide(
+        body, full_range, out=np.zeros_like(body), where=full_range >= 1e-10
+    )
+
+    return BarFeatures(
+        prev_close=prev_close,
+        full_range=full_range,
+        hpc=hpc,
+        lpc=lpc,
+        tr=tr,
+        body_signed=body_signed,
+        body=body,
+        ratio=ratio,
+        lower_shadow=np.minimum(opens, closes) - lows,
+        upper_shadow=highs - np.maximum(opens, closes),
+    )
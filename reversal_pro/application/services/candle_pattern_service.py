@@ -16,8 +16,12 @@ References
 
 from __future__ import annotations
 
+from typing import Optional
+
 import numpy as np
 
+from .bar_features import BarFeatures, compute_bar_features
+
 
 class CandlePatternService:
     """Detect key reversal candlestick patterns to accelerate pivot confirmation."""
@@ -52,6 +56,7 @@ class CandlePatternService:
         highs: np.ndarray,
         lows: np.ndarray,
         closes: np.ndarray,
+        features: Optional[BarFeatures] = None,
     ) -> np.ndarray:
         """
         Return a per-bar multiplier in [reduction, 1.0].
@@ -59,63 +64,51 @@ class CandlePatternService:
         Parameters
         ----------
         opens, highs, lows, closes : 1-D arrays of bar OHLC prices.
+        features : pre-computed bar features (computed here if omitted).
 
         Returns
         -------
         np.ndarray of shape (n,) — multiply onto reversal_amounts.
         """
+        opens = np.asarray(opens, dtype=np.float64)
+        closes = np.asarray(closes, dtype=np.float64)
         n = len(closes)
         reduction = np.ones(n, dtype=float)
-
-        for i in range(1, n):
-            body = abs(closes[i] - opens[i])
-            full_range = highs[i] - lows[i]
-            if full_range < 1e-10:
-                continue
-
-            ratio = body / full_range
-            prev_body_signed = closes[i - 1] - opens[i - 1]
-
-            # ── Bullish Engulfing ────────────────────────────────────
-            # Previous candle was bearish, current bullish body engulfs it
-            if (prev_body_signed < 0
-                    and closes[i] > opens[i]
-                    and closes[i] > opens[i - 1]
-                    and opens[i] < closes[i - 1]):
-                reduction[i] = min(reduction[i], self.engulfing_reduction)
-                continue  # strongest pattern — skip weaker checks
-
-            # ── Bearish Engulfing ────────────────────────────────────
-            if (prev_body_signed > 0
-                    and closes[i] < opens[i]
-                    and closes[i] < opens[i - 1]
-                    and opens[i] > closes[i - 1]):
-                reduction[i] = min(reduction[i], self.engulfing_reduction)
-                continue
-
-            # ── Hammer (bullish) ─────────────────────────────────────
-            # Small body at the top of the range, long lower shadow
-            lower_shadow = min(opens[i], closes[i]) - lows[i]
-            upper_shadow = highs[i] - max(opens[i], closes[i])
-            if (ratio < self.body_ratio_threshold
-                    and lower_shadow > 2.0 * body
-                    and upper_shadow < body
-                    and closes[i] >= opens[i]):
-                reduction[i] = min(reduction[i], self.hammer_reduction)
-                continue
-
-            # ── Shooting Star (bearish) ──────────────────────────────
-            # Small body at the bottom of the range, long upper shadow
-            if (ratio < self.body_ratio_threshold
-                    and upper_shadow > 2.0 * body
-                    and lower_shadow < body
-                    and closes[i] <= opens[i]):
-                reduction[i] = min(reduction[i], self.hammer_reduction)
-                continue
-
-            # ── Doji ─────────────────────────────────────────────────
-            # Very small body relative to range → indecision
-            if ratio < 0.10:
-                reduction[i] = min(reduction[i], self.doji_reduction)
-
+        if n < 2:
+            return reduction
+        if features is None:
+            features = compute_bar_features(opens, highs, lows, closes)
+
+        # Bar i against bar i-1, for i = 1 … n-1
+        o, c = opens[1:], closes[1:]
+        prev_o, prev_c = opens[:-1], closes[:-1]
+
+        body = features.body[1:]
+        valid = features.full_range[1:] >= 1e-10
+        ratio = features.ratio[1:]
+        prev_body_signed = features.body_signed[:-1]
+        lower_shadow = features.lower_shadow[1:]
+        upper_shadow = features.upper_shadow[1:]
+        small_body = ratio < self.body_ratio_threshold
+
+        # ── Engulfing (bullish / bearish) ────────────────────────
+        engulfing = (
+            ((prev_body_signed < 0) & (c > o) & (c > prev_o) & (o < prev_c))
+            | ((prev_body_signed > 0) & (c < o) & (c < prev_o) & (o > prev_c))
+        )
+        # ── Hammer (bullish) / Shooting Star (bearish) ───────────
+        hammer = small_body & (
+            ((lower_shadow > 2.0 * body) & (upper_shadow < body) & (c >= o))
+            | ((upper_shadow > 2.0 * body) & (lower_shadow < body) & (c <= o))
+        )
+        # ── Doji ─────────────────────────────────────────────────
+        doji = ratio < 0.10
+
+        # Strongest pattern wins: engulfing > hammer/star > doji
+        factor = np.where(
+            engulfing, self.engulfing_reduction,
+            np.where(hammer, self.hammer_reduction,
+                     np.where(doji, self.doji_reduction, 1.0)),
+        )
+        reduction[1:] = np.where(valid, np.minimum(factor, 1.0), 1.0)
         return reduction
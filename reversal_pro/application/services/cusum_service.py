@@ -20,8 +20,39 @@ References
 
 from __future__ import annotations
 
+from collections import deque
+from typing import Optional
+
 import numpy as np
 
+from ._jit import njit
+
+
+@njit(cache=True)
+def _cusum_kernel(returns, drifts, thresholds, min_reduction, decay_bars):
+    """Single-pass CUSUM recurrence + decay over pre-scaled per-bar limits."""
+    n = returns.shape[0]
+    reduction = np.ones(n)
+    span = max(decay_bars, 1)
+
+    s_pos = 0.0  # upward cumulative sum
+    s_neg = 0.0  # downward cumulative sum
+
+    for i in range(1, n):
+        s_pos = max(0.0, s_pos + returns[i] - drifts[i])
+        s_neg = max(0.0, s_neg - returns[i] - drifts[i])
+
+        if s_pos > thresholds[i] or s_neg > thresholds[i]:
+            s_pos = 0.0
+            s_neg = 0.0
+            # Apply the decaying reduction right away
+            for d in range(min(decay_bars + 1, n - i)):
+                value = min_reduction + (d / span) * (1.0 - min_reduction)
+                if value < reduction[i + d]:
+                    reduction[i + d] = value
+
+    return reduction
+
 
 class CUSUMService:
     """
@@ -76,43 +107,72 @@ class CUSUMService:
         -------
         np.ndarray of shape (n,) — multiply onto reversal_amounts.
         """
-        n = len(closes)
-        reduction = np.ones(n, dtype=float)
-
-        if n < 2:
-            return reduction
+        closes = np.asarray(closes, dtype=np.float64)
+        if len(closes) < 2:
+            return np.ones(len(closes), dtype=float)
 
         returns = np.diff(closes, prepend=closes[0])
 
-        s_pos = 0.0  # upward cumulative sum
-        s_neg = 0.0  # downward cumulative sum
-        change_points: list[int] = []
-
-        for i in range(1, n):
-            atr = atr_values[i] if not np.isnan(atr_values[i]) else 0.0
-            if atr <= 0:
-                # Fallback: use the absolute return as proxy
-                atr = max(abs(returns[i]), 1e-10)
-
-            drift = self.drift_fraction * atr
-            threshold = self.threshold_mult * atr
-
-            s_pos = max(0.0, s_pos + returns[i] - drift)
-            s_neg = max(0.0, s_neg - returns[i] - drift)
-
-            if s_pos > threshold or s_neg > threshold:
-                change_points.append(i)
-                s_pos = 0.0
-                s_neg = 0.0
-
-        # Apply decay reduction around each change point
-        for cp in change_points:
-            for d in range(self.decay_bars + 1):
-                idx = cp + d
-                if idx >= n:
-                    break
-                t = d / max(self.decay_bars, 1)
-                value = self.min_reduction + t * (1.0 - self.min_reduction)
-                reduction[idx] = min(reduction[idx], value)
+        # Effective ATR: the absolute return stands in where ATR is not
+        # ready yet (NaN) or degenerate (<= 0)
+        atr = np.asarray(atr_values, dtype=np.float64)
+        fallback = np.maximum(np.abs(returns), 1e-10)
+        with np.errstate(invalid="ignore"):
+            atr_eff = np.where(np.isnan(atr) | (atr <= 0), fallback, atr)
+
+        return _cusum_kernel(
+            returns,
+            self.drift_fraction * atr_eff,
+            self.threshold_mult * atr_eff,
+            float(self.min_reduction),
+            int(self.decay_bars),
+        )
+
+
+class CUSUMStateful:
+    """
+    Incremental :meth:`CUSUMService.compute_reduction` for live bars.
+
+    Carries the two accumulators and the change points still inside the
+    decay window, so each :meth:`update` is O(decay_bars).  The recurrence
+    is the same as ``_cusum_kernel``'s, so the reductions match the batch
+    output bar for bar.
+    """
 
+    def __init__(self, service: CUSUMService):
+        self.service = service
+        self._prev_close: Optional[float] = None
+        self._s_pos = 0.0
+        self._s_neg = 0.0
+        self._bar = -1
+        self._changes: deque = deque()  # bar indices of recent change points
+
+    def update(self, close: float, atr: float) -> float:
+        """Feed one bar's close and ATR (NaN while warming up)."""
+        svc = self.service
+        self._bar += 1
+        prev_close, self._prev_close = self._prev_close, close
+        if prev_close is None:
+            return 1.0
+
+        ret = close - prev_close
+        if atr != atr or atr <= 0:  # NaN or degenerate
+            atr = max(abs(ret), 1e-10)
+        self._s_pos = max(0.0, self._s_pos + ret - svc.drift_fraction * atr)
+        self._s_neg = max(0.0, self._s_neg - ret - svc.drift_fraction * atr)
+        threshold = svc.threshold_mult * atr
+        if self._s_pos > threshold or self._s_neg > threshold:
+            self._s_pos = 0.0
+            self._s_neg = 0.0
+            self._changes.append(self._bar)
+
+        while self._changes and self._bar - self._changes[0] > svc.decay_bars:
+            self._changes.popleft()
+        span = max(svc.decay_bars, 1)
+        reduction = 1.0
+        for bar in self._changes:
+            d = self._bar - bar
+            value = svc.min_reduction + (d / span) * (1.0 - svc.min_reduction)
+            if value < reduction:
+                reduction = value
         return reduction
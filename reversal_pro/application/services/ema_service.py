@@ -1,11 +1,143 @@
 """EMA (Exponential Moving Average) and trend detection service."""
 
 import numpy as np
-from typing import List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from scipy.signal import lfilter
 
+from ._jit import njit
 from ...domain.enums import TrendState
 from ...domain.entities import TrendInfo, EMAState
 
+# int8 codes produced by the trend kernel, indexed into this tuple
+TREND_NEUTRAL, TREND_BULLISH, TREND_BEARISH = 0, 1, 2
+_TREND_STATES = (TrendState.NEUTRAL, TrendState.BULLISH, TrendState.BEARISH)
+
+
+@njit(cache=True)
+def _trend_kernel(highs, lows, ema9, ema14, ema21,
+                  buy_signal, sell_signal, prev_buy, prev_sell):
+    """Run the triple-EMA state machine over every bar.
+
+    Bars where any EMA is still NaN stay NEUTRAL and leave the state
+    untouched.  Returns the per-bar columns plus the final state.
+    """
+    n = highs.shape[0]
+    states = np.zeros(n, dtype=np.int8)
+    buy_now = np.zeros(n, dtype=np.bool_)
+    sell_now = np.zeros(n, dtype=np.bool_)
+    to_bull = np.zeros(n, dtype=np.bool_)
+    to_bear = np.zeros(n, dtype=np.bool_)
+
+    for i in range(n):
+        e9 = ema9[i]
+        e14 = ema14[i]
+        e21 = ema21[i]
+        if e9 != e9 or e14 != e14 or e21 != e21:  # any NaN
+            continue
+
+        # prev_*_signal always equals *_signal from the previous bar
+        prev_buy_signal = buy_signal
+        prev_sell_signal = sell_signal
+
+        buy = e9 > e14 and e14 > e21 and lows[i] > e9
+        stop_buy = e9 <= e14
+        buy_now[i] = buy and not prev_buy
+        if buy_now[i] and not stop_buy:
+            buy_signal = 1
+        elif buy_signal == 1 and stop_buy:
+            buy_signal = 0
+
+        sell = e9 < e14 and e14 < e21 and highs[i] < e9
+        stop_sell = e9 >= e14
+        sell_now[i] = sell and not prev_sell
+        if sell_now[i] and not stop_sell:
+            sell_signal = 1
+        elif sell_signal == 1 and stop_sell:
+            sell_signal = 0
+
+        if buy_signal == 1:
+            states[i] = TREND_BULLISH
+        elif sell_signal == 1:
+            states[i] = TREND_BEARISH
+
+        to_bull[i] = buy_signal == 1 and prev_buy_signal != 1
+        to_bear[i] = sell_signal == 1 and prev_sell_signal != 1
+
+        prev_buy = buy
+        prev_sell = sell
+
+    return (states, buy_now, sell_now, to_bull, to_bear,
+            buy_signal, sell_signal, prev_buy, prev_sell)
+
+
+class EMAStateful:
+    """
+    Incremental triple-EMA trend for live bars.
+
+    Each :meth:`update` advances the three EMAs by one multiply-add and
+    runs the trend state machine for the new bar only, so a live loop
+    pays O(1) per candle instead of re-running :meth:`EMAService.compute_trend`
+    over the whole history.  Every EMA is seeded with the SMA of its first
+    ``period`` closes, exactly as the batch :meth:`EMAService.ema` does, so
+    once all three EMAs are ready the output matches the batch TrendInfo
+    bar for bar.
+    """
+
+    def __init__(self, superfast_length: int = 9, fast_length: int = 14,
+                 slow_length: int = 21):
+        self.periods = (superfast_length, fast_length, slow_length)
+        self._alphas = tuple(2.0 / (p + 1) for p in self.periods)
+        self._emas: List[Optional[float]] = [None, None, None]
+        self._seed: List[float] = []   # closes kept until every EMA is seeded
+        self.state = EMAState()
+
+    @property
+    def ready(self) -> bool:
+        """True once all three EMAs have been seeded."""
+        # Check each one: custom lengths need not be ordered fast < slow
+        return all(e is not None for e in self._emas)
+
+    def _advance(self, close: float) -> None:
+        if not self.ready:
+            self._seed.append(close)
+        for k, (period, alpha) in enumerate(zip(self.periods, self._alphas)):
+            prev = self._emas[k]
+            if prev is not None:
+                self._emas[k] = alpha * close + (1.0 - alpha) * prev
+            elif len(self._seed) == period:
+                self._emas[k] = float(np.mean(self._seed[:period]))
+        if self.ready:
+            self._seed = []
+
+    def update(self, close: float, high: float, low: float) -> TrendInfo:
+        """Feed one closed bar and return its TrendInfo."""
+        self._advance(float(close))
+        e9, e14, e21 = (np.nan if e is None else e for e in self._emas)
+
+        state = self.state
+        (states, buy_now, sell_now, to_bull, to_bear,
+         buy_signal, sell_signal, prev_buy, prev_sell) = _trend_kernel(
+            np.array([high], dtype=np.float64),
+            np.array([low], dtype=np.float64),
+            np.array([e9]), np.array([e14]), np.array([e21]),
+            state.buy_signal, state.sell_signal, state.prev_buy, state.prev_sell,
+        )
+        state.buy_signal = state.prev_buy_signal = int(buy_signal)
+        state.sell_signal = state.prev_sell_signal = int(sell_signal)
+        state.prev_buy = bool(prev_buy)
+        state.prev_sell = bool(prev_sell)
+
+        return TrendInfo(
+            state=_TREND_STATES[states[0]],
+            ema_fast=0.0 if e9 != e9 else e9,  # NaN is the only x != x
+            ema_mid=0.0 if e14 != e14 else e14,
+            ema_slow=0.0 if e21 != e21 else e21,
+            buy_signal=bool(buy_now[0]),
+            sell_signal=bool(sell_now[0]),
+            trend_changed_to_bullish=bool(to_bull[0]),
+            trend_changed_to_bearish=bool(to_bear[0]),
+        )
+
 
 class EMAService:
     """Computes EMAs and derives triple-EMA trend signals."""
@@ -25,15 +157,69 @@ class EMAService:
 
         # Seed with SMA over first `period` bars
         if n >= period:
-            result[period - 1] = np.mean(data[:period])
-            for i in range(period, n):
-                result[i] = alpha * data[i] + (1.0 - alpha) * result[i - 1]
+            seed = np.mean(data[:period])
+            result[period - 1] = seed
+            # First-order IIR filter seeded with the SMA (same as ATR's RMA)
+            if n > period:
+                decay = 1.0 - alpha
+                result[period:] = lfilter(
+                    [alpha], [1.0, -decay], data[period:], zi=[seed * decay]
+                )[0]
         else:
             # Not enough data — compute SMA of available
             result[-1] = np.mean(data)
 
         return result
 
+    @staticmethod
+    def compute_trend_arrays(
+        closes: np.ndarray,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        superfast_length: int = 9,
+        fast_length: int = 14,
+        slow_length: int = 21,
+    ) -> Tuple[Dict[str, np.ndarray], EMAState]:
+        """
+        Column (struct-of-arrays) form of :meth:`compute_trend`.
+
+        Returns a dict with the three EMAs, the int8 ``state`` codes
+        (see ``TREND_*``) and boolean ``buy_signal``, ``sell_signal``,
+        ``to_bullish`` and ``to_bearish`` columns, plus the final EMAState.
+        Use this when no per-bar TrendInfo objects are needed.
+        """
+        closes = np.asarray(closes, dtype=np.float64)
+        ema9 = EMAService.ema(closes, superfast_length)
+        ema14 = EMAService.ema(closes, fast_length)
+        ema21 = EMAService.ema(closes, slow_length)
+
+        (states, buy_now, sell_now, to_bull, to_bear,
+         buy_signal, sell_signal, prev_buy, prev_sell) = _trend_kernel(
+            np.asarray(highs, dtype=np.float64),
+            np.asarray(lows, dtype=np.float64),
+            ema9, ema14, ema21, 0, 0, False, False,
+        )
+
+        state = EMAState(
+            buy_signal=int(buy_signal),
+            sell_signal=int(sell_signal),
+            prev_buy=bool(prev_buy),
+            prev_sell=bool(prev_sell),
+            prev_buy_signal=int(buy_signal),
+            prev_sell_signal=int(sell_signal),
+        )
+        columns = {
+            "ema_fast": ema9,
+            "ema_mid": ema14,
+            "ema_slow": ema21,
+            "state": states,
+            "buy_signal": buy_now,
+            "sell_signal": sell_now,
+            "to_bullish": to_bull,
+            "to_bearish": to_bear,
+        }
+        return columns, state
+
     @staticmethod
     def compute_trend(
         closes: np.ndarray,
@@ -50,76 +236,48 @@ class EMAService:
         Buy: EMA9 > EMA14 > EMA21 and low > EMA9
         Sell: EMA9 < EMA14 < EMA21 and high < EMA9
         """
-        n = len(closes)
-
-        ema9 = EMAService.ema(closes, superfast_length)
-        ema14 = EMAService.ema(closes, fast_length)
-        ema21 = EMAService.ema(closes, slow_length)
+        cols, state = EMAService.compute_trend_arrays(
+            closes, highs, lows, superfast_length, fast_length, slow_length,
+        )
+        return EMAService.trend_infos(cols), state
 
-        state = EMAState()
-        trends: List[TrendInfo] = []
-
-        for i in range(n):
-            e9 = ema9[i]
-            e14 = ema14[i]
-            e21 = ema21[i]
-
-            if np.isnan(e9) or np.isnan(e14) or np.isnan(e21):
-                trends.append(TrendInfo(
-                    state=TrendState.NEUTRAL,
-                    ema_fast=e9 if not np.isnan(e9) else 0.0,
-                    ema_mid=e14 if not np.isnan(e14) else 0.0,
-                    ema_slow=e21 if not np.isnan(e21) else 0.0,
-                ))
-                continue
-
-            # Buy conditions
-            buy = e9 > e14 and e14 > e21 and lows[i] > e9
-            stop_buy = e9 <= e14
-            buy_now = buy and not state.prev_buy
-
-            prev_buy_signal = state.buy_signal
-            if buy_now and not stop_buy:
-                state.buy_signal = 1
-            elif state.buy_signal == 1 and stop_buy:
-                state.buy_signal = 0
-
-            # Sell conditions
-            sell = e9 < e14 and e14 < e21 and highs[i] < e9
-            stop_sell = e9 >= e14
-            sell_now = sell and not state.prev_sell
-
-            prev_sell_signal = state.sell_signal
-            if sell_now and not stop_sell:
-                state.sell_signal = 1
-            elif state.sell_signal == 1 and stop_sell:
-                state.sell_signal = 0
-
-            # Determine trend state
-            if state.buy_signal == 1:
-                trend_state = TrendState.BULLISH
-            elif state.sell_signal == 1:
-                trend_state = TrendState.BEARISH
-            else:
-                trend_state = TrendState.NEUTRAL
-
-            trend_to_bullish = state.buy_signal == 1 and state.prev_buy_signal != 1
-            trend_to_bearish = state.sell_signal == 1 and state.prev_sell_signal != 1
-
-            trends.append(TrendInfo(
-                state=trend_state,
+    @staticmethod
+    def trend_infos(columns: Dict[str, np.ndarray]) -> List[TrendInfo]:
+        """One TrendInfo per bar from :meth:`compute_trend_arrays` columns."""
+        # Warm-up bars report 0.0 for EMAs that are not defined yet
+        return [
+            TrendInfo(
+                state=_TREND_STATES[code],
                 ema_fast=e9,
                 ema_mid=e14,
                 ema_slow=e21,
-                buy_signal=buy_now,
-                sell_signal=sell_now,
-                trend_changed_to_bullish=trend_to_bullish,
-                trend_changed_to_bearish=trend_to_bearish,
-            ))
-
-            state.prev_buy = buy
-            state.prev_sell = sell
-            state.prev_buy_signal = state.buy_signal
-            state.prev_sell_signal = state.sell_signal
-
-        return trends, state
+                buy_signal=buy,
+                sell_signal=sell,
+                trend_changed_to_bullish=bull,
+                trend_changed_to_bearish=bear,
+            )
+            for code, e9, e14, e21, buy, sell, bull, bear in zip(
+                columns["state"].tolist(),
+                np.nan_to_num(columns["ema_fast"], nan=0.0).tolist(),
+                np.nan_to_num(columns["ema_mid"], nan=0.0).tolist(),
+                np.nan_to_num(columns["ema_slow"], nan=0.0).tolist(),
+                columns["buy_signal"].tolist(),
+                columns["sell_signal"].tolist(),
+                columns["to_bullish"].tolist(),
+                columns["to_bearish"].tolist(),
+            )
+        ]
+
+    @staticmethod
+    def stream(
+        closes: Iterable[float],
+        highs: Iterable[float],
+        lows: Iterable[float],
+        superfast_length: int = 9,
+        fast_length: int = 14,
+        slow_length: int = 21,
+    ) -> Iterator[TrendInfo]:
+        """Yield one TrendInfo per bar using the incremental EMAStateful."""
+        tracker = EMAStateful(superfast_length, fast_length, slow_length)
+        for close, high, low in zip(closes, highs, lows):
+            yield tracker.update(close, high, low)
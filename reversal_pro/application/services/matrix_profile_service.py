@@ -21,16 +21,23 @@ References
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import math
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import List, Optional
 
 import numpy as np
 
+from ._jit import njit
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Lazy import — stumpy is heavy; we only load it when actually needed.
+# MatrixProfileService.warmup() compiles its kernels ahead of time.
 # ---------------------------------------------------------------------------
 _stumpy = None
 
@@ -40,15 +47,55 @@ def _get_stumpy():
     if _stumpy is None:
         try:
             import stumpy as _s
-            _stumpy = _s
         except ImportError:
             raise ImportError(
                 "stumpy is required for Matrix-Profile-based regime detection. "
                 "Install it with:  pip install stumpy"
             )
+        _stumpy = _s
     return _stumpy
 
 
+# ---------------------------------------------------------------------------
+# GPU dispatch — stumpy.gpu_stump runs the same join on CUDA.  Transfers
+# and kernel launches only pay off on long series, so auto mode keeps
+# short ones on the CPU.
+# ---------------------------------------------------------------------------
+GPU_MIN_LENGTH = 5_000
+
+_cuda_ok: Optional[bool] = None
+
+
+def _cuda_available() -> bool:
+    """True when numba can see a CUDA device (probed once per process)."""
+    global _cuda_ok
+    if _cuda_ok is None:
+        try:
+            from numba import cuda
+            _cuda_ok = bool(cuda.is_available())
+        except Exception:  # no numba / broken driver → CPU only
+            _cuda_ok = False
+    return _cuda_ok
+
+
+# ---------------------------------------------------------------------------
+# Result cache — the same close series is often analysed several times
+# (agents sharing a symbol/timeframe, optimizer sweeps, MP on/off runs).
+# Keyed on a content hash of the series plus every parameter that affects
+# the output; shared across instances since use cases are short-lived.
+# ---------------------------------------------------------------------------
+RESULT_CACHE_SIZE = 16
+
+_result_cache: "OrderedDict[tuple, MatrixProfileResult]" = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def clear_result_cache() -> None:
+    """Drop every cached MatrixProfileResult."""
+    with _result_cache_lock:
+        _result_cache.clear()
+
+
 # ---------------------------------------------------------------------------
 # Result containers
 # ---------------------------------------------------------------------------
@@ -76,6 +123,77 @@ class MatrixProfileResult:
     threshold_reduction: np.ndarray
 
 
+# ---------------------------------------------------------------------------
+# Novelty → change points → threshold reduction (compiled kernel)
+# ---------------------------------------------------------------------------
+
+@njit(cache=True)
+def _log_returns_nb(closes):
+    """
+    Log-returns of ``closes`` in one pass, with non-finite values (zero or
+    negative prices, gaps) replaced by 0.0.  Each log is taken once and
+    carried to the next bar.
+    """
+    n = closes.shape[0]
+    out = np.empty(max(n - 1, 0))
+    if n == 0:
+        return out
+    prev = math.log(closes[0]) if closes[0] > 0 else -np.inf
+    for i in range(1, n):
+        cur = math.log(closes[i]) if closes[i] > 0 else -np.inf
+        r = cur - prev
+        out[i - 1] = r if math.isfinite(r) else 0.0
+        prev = cur
+    return out
+
+
+@njit(cache=True)
+def _novelty_to_reduction_nb(
+    scores, z_threshold, min_reduction, score_decay_bars, min_gap,
+):
+    """
+    Pick change points from per-bar novelty scores and build the per-bar
+    reduction multiplier in [min_reduction, 1.0].
+
+    A bar is a change point when its score is >= z_threshold; points
+    closer than ``min_gap`` bars are merged, keeping the strongest.  At a
+    change point the multiplier drops with the score's excess over the
+    threshold, then decays linearly back to 1.0 over ``score_decay_bars``
+    (overlapping reductions keep the minimum).
+
+    Returns ``(reduction, change_point_indices)``.  No fastmath: the
+    scores contain NaN for bars where the profile is not ready.
+    """
+    n = len(scores)
+    cp_idx = np.empty(n, dtype=np.int64)
+    count = 0
+    for i in range(n):
+        score = scores[i]
+        if np.isnan(score) or score < z_threshold:
+            continue
+        if count > 0 and i - cp_idx[count - 1] < min_gap:
+            if score > scores[cp_idx[count - 1]]:
+                cp_idx[count - 1] = i
+        else:
+            cp_idx[count] = i
+            count += 1
+
+    reduction = np.ones(n)
+    # Linear 0 → 1 decay template shared by every change point
+    ramp = np.arange(score_decay_bars + 1) / max(score_decay_bars, 1)
+    for k in range(count):
+        start = cp_idx[k]
+        end = min(n, start + ramp.shape[0])
+        # Sigmoid-like strength: 1 - 1/(1 + score - threshold)
+        excess = max(0.0, scores[start] - z_threshold)
+        strength = 1.0 - 1.0 / (1.0 + excess)
+        floor = min_reduction + (1.0 - strength) * (1.0 - min_reduction)
+        window = reduction[start:end]
+        np.minimum(window, floor + ramp[:end - start] * (1.0 - floor), window)
+
+    return reduction, cp_idx[:count]
+
+
 # ---------------------------------------------------------------------------
 # Service
 # ---------------------------------------------------------------------------
@@ -109,6 +227,17 @@ class MatrixProfileService:
         If True, compute the Matrix Profile on log-returns rather than
         raw close prices.  Returns are more stationary and usually give
         better results.
+    use_gpu : bool, optional
+        Run the profile with ``stumpy.gpu_stump``.  ``None`` (default)
+        picks the GPU only when CUDA is available and the series has at
+        least ``GPU_MIN_LENGTH`` points; ``False`` always stays on the CPU.
+    streaming : bool
+        Keep a ``stumpy.stumpi`` state between calls.  When the next
+        ``analyze`` receives the previous closes plus appended bars, only
+        the new points are folded in instead of re-running the full join
+        (live polling).  Any other series restarts the stream.  Requires
+        ``use_returns`` (``ValueError`` otherwise); normalised closes
+        shift with every new bar.
     """
 
     DEFAULT_SUBSEQ_LEN = {
@@ -138,7 +267,14 @@ class MatrixProfileService:
         score_decay_bars: int = 6,
         use_returns: bool = True,
         timeframe: str = "1h",
+        use_gpu: Optional[bool] = None,
+        streaming: bool = False,
     ):
+        if streaming and not use_returns:
+            raise ValueError(
+                "streaming=True requires use_returns=True: normalised closes "
+                "change with every new bar, so they cannot be streamed"
+            )
         self.subsequence_length = (
             subsequence_length
             or self.DEFAULT_SUBSEQ_LEN.get(timeframe, 10)
@@ -149,11 +285,29 @@ class MatrixProfileService:
         self.score_decay_bars = score_decay_bars
         self.use_returns = use_returns
         self.timeframe = timeframe
+        self.use_gpu = use_gpu
+        self.streaming = streaming
+        self._series: Optional[np.ndarray] = None         # last analyze() input
+        self._stream = None                               # stumpy.stumpi state
+        self._stream_closes: Optional[np.ndarray] = None  # closes it covers
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
+    @classmethod
+    def warmup(cls, timeframe: Optional[str] = None) -> None:
+        """
+        JIT-compile stumpy and this module's kernels on a tiny synthetic
+        series so the first real :meth:`analyze` doesn't pay several
+        seconds of compilation.  Call once at process start (the API does
+        it in the background on startup).  Bypasses the result cache.
+        """
+        svc = cls(timeframe=timeframe or "1h")
+        n = 2 * svc.subsequence_length + svc.rolling_window + 16
+        closes = 100.0 * np.exp(np.cumsum(np.random.RandomState(0).randn(n) * 0.01))
+        svc._analyze(closes)
+
     def analyze(self, closes: np.ndarray) -> MatrixProfileResult:
         """
         Run the Matrix-Profile-based regime-change detection.
@@ -165,7 +319,50 @@ class MatrixProfileService:
         Returns
         -------
         MatrixProfileResult with per-bar scores & change points.
+        Results are cached and shared between calls — treat them as
+        read-only (their arrays are flagged non-writeable).
+        """
+        closes = np.ascontiguousarray(closes, dtype=float)
+        if self.streaming:
+            self._series = closes
+        key = self._cache_key(closes)
+        with _result_cache_lock:
+            cached = _result_cache.get(key)
+            if cached is not None:
+                _result_cache.move_to_end(key)
+                return cached
+
+        result = self._analyze(closes)
+        result.novelty_scores.flags.writeable = False
+        result.threshold_reduction.flags.writeable = False
+
+        with _result_cache_lock:
+            _result_cache[key] = result
+            while len(_result_cache) > RESULT_CACHE_SIZE:
+                _result_cache.popitem(last=False)
+        return result
+
+    def analyze_incremental(self, new_close: float) -> MatrixProfileResult:
+        """
+        Append one close to the series last passed to :meth:`analyze`
+        and re-run the analysis, updating the streamed profile in place.
+        Requires ``streaming=True`` and a prior ``analyze`` call.
         """
+        if not self.streaming or self._series is None:
+            raise RuntimeError(
+                "analyze_incremental() needs streaming=True and a prior analyze()"
+            )
+        return self.analyze(np.append(self._series, new_close))
+
+    def _cache_key(self, closes: np.ndarray) -> tuple:
+        digest = hashlib.blake2b(closes.tobytes(), digest_size=16).digest()
+        return (
+            digest, len(closes), self.subsequence_length, self.z_threshold,
+            self.rolling_window, self.min_reduction, self.score_decay_bars,
+            self.use_returns,
+        )
+
+    def _analyze(self, closes: np.ndarray) -> MatrixProfileResult:
         stumpy = _get_stumpy()
         n = len(closes)
         m = self.subsequence_length
@@ -188,14 +385,12 @@ class MatrixProfileService:
 
         # ── Compute the Matrix Profile ───────────────────────────────
         try:
-            mp = stumpy.stump(ts, m)
+            mp_dist = self._matrix_profile(stumpy, closes, ts, m)
         except Exception as exc:
             logger.warning("stumpy.stump failed: %s — skipping MP.", exc)
+            self._stream = self._stream_closes = None
             return self._empty_result(n)
 
-        # MP distances (1st column)
-        mp_dist = mp[:, 0].astype(float)
-
         # ── Compute rolling Z-scores of MP distances ─────────────────
         rolling_z = self._rolling_z_score(mp_dist, self.rolling_window)
 
@@ -208,33 +403,26 @@ class MatrixProfileService:
         offset = (m - 1) + (1 if self.use_returns else 0)
 
         novelty_scores = np.full(n, np.nan)
-        for j in range(len(rolling_z)):
-            bar_idx = j + offset
-            if 0 <= bar_idx < n:
-                novelty_scores[bar_idx] = rolling_z[j]
-
-        # ── Detect significant change points ─────────────────────────
-        change_points: List[RegimeChangePoint] = []
-
-        for i in range(n):
-            if np.isnan(novelty_scores[i]):
-                continue
-            if novelty_scores[i] >= self.z_threshold:
-                change_points.append(
-                    RegimeChangePoint(
-                        bar_index=i,
-                        score=float(novelty_scores[i]),
-                        is_significant=True,
-                    )
-                )
-
-        # ── Merge nearby change points (keep strongest) ──────────────
-        change_points = self._merge_nearby(change_points, min_gap=m)
-
-        # ── Compute per-bar threshold reduction factor ───────────────
-        threshold_reduction = self._compute_reduction(
-            n, change_points, novelty_scores,
+        end = min(n, offset + len(rolling_z))
+        if end > offset:
+            novelty_scores[offset:end] = rolling_z[:end - offset]
+
+        # ── Change points (merged) + per-bar threshold reduction ─────
+        threshold_reduction, cp_idx = _novelty_to_reduction_nb(
+            novelty_scores,
+            float(self.z_threshold),
+            float(self.min_reduction),
+            int(self.score_decay_bars),
+            int(m),
         )
+        change_points: List[RegimeChangePoint] = [
+            RegimeChangePoint(
+                bar_index=int(i),
+                score=float(novelty_scores[i]),
+                is_significant=True,
+            )
+            for i in cp_idx
+        ]
 
         logger.info(
             "MatrixProfile: n=%d  m=%d  change_points=%d  z_threshold=%.2f",
@@ -255,11 +443,8 @@ class MatrixProfileService:
     def _prepare_series(self, closes: np.ndarray) -> np.ndarray:
         """Return log-returns or normalised closes."""
         if self.use_returns:
-            # Log-returns are more stationary
-            lr = np.diff(np.log(closes))
-            # Replace any inf/nan with 0
-            lr[~np.isfinite(lr)] = 0.0
-            return lr
+            # Log-returns are more stationary; inf/nan become 0
+            return _log_returns_nb(closes)
         else:
             # z-normalise
             mu = float(np.mean(closes))
@@ -268,78 +453,75 @@ class MatrixProfileService:
                 return closes - mu
             return (closes - mu) / sd
 
+    @staticmethod
+    def _rolling_mean_std(arr: np.ndarray, window: int):
+        """
+        Causal rolling mean / population std over the last `window`
+        values (fewer at the start), from running sums in O(n).
+        """
+        n = len(arr)
+        x = arr.astype(float)
+        # Centre first: MP distances sit on a large positive offset and
+        # E[x²] - E[x]² would otherwise cancel most significant digits.
+        offset = x.mean() if n else 0.0
+        x -= offset
+        s1 = np.concatenate(([0.0], np.cumsum(x)))
+        s2 = np.concatenate(([0.0], np.cumsum(x * x)))
+
+        end = np.arange(1, n + 1)
+        start = np.maximum(0, end - window)
+        count = end - start
+
+        mu = (s1[end] - s1[start]) / count
+        mean_sq = (s2[end] - s2[start]) / count
+        var = mean_sq - mu * mu
+        # What is left after cancelling against mean_sq is rounding noise
+        # (e.g. a flat stretch), not spread
+        var[var <= 1e-12 * mean_sq] = 0.0
+        sd = np.sqrt(var)
+        return mu + offset, sd
+
     @staticmethod
     def _rolling_z_score(arr: np.ndarray, window: int) -> np.ndarray:
         """
         Compute a rolling (causal) Z-score for each element.
         Uses only past data (no look-ahead).
         """
-        n = len(arr)
-        result = np.zeros(n, dtype=float)
-
-        for i in range(n):
-            start = max(0, i - window + 1)
-            chunk = arr[start:i + 1].astype(float)
-            mu = float(np.mean(chunk))
-            sd = float(np.std(chunk))
-            if sd > 1e-10:
-                result[i] = (float(arr[i]) - mu) / sd
-            else:
-                result[i] = 0.0
-
+        mu, sd = MatrixProfileService._rolling_mean_std(arr, window)
+        result = np.zeros(len(arr), dtype=float)
+        ok = sd > 1e-10
+        result[ok] = (arr[ok] - mu[ok]) / sd[ok]
         return result
 
-    def _merge_nearby(
-        self,
-        points: List[RegimeChangePoint],
-        min_gap: int,
-    ) -> List[RegimeChangePoint]:
-        """Keep only the strongest point in each min_gap window."""
-        if not points:
-            return points
-        merged: List[RegimeChangePoint] = [points[0]]
-        for pt in points[1:]:
-            if pt.bar_index - merged[-1].bar_index < min_gap:
-                # Keep the one with the higher score
-                if pt.score > merged[-1].score:
-                    merged[-1] = pt
+    def _matrix_profile(self, stumpy, closes: np.ndarray, ts: np.ndarray,
+                        m: int) -> np.ndarray:
+        """MP distances for ``ts`` — streamed, on the GPU, or a full join."""
+        if self.streaming:
+            prev = self._stream_closes
+            if (
+                self._stream is not None
+                and len(closes) > len(prev)
+                and np.array_equal(closes[:len(prev)], prev)
+            ):
+                # Appended bars only: one O(n) update per new return
+                for value in ts[len(prev) - 1:]:
+                    self._stream.update(value)
             else:
-                merged.append(pt)
-        return merged
-
-    def _compute_reduction(
-        self,
-        n: int,
-        change_points: List[RegimeChangePoint],
-        scores: np.ndarray,
-    ) -> np.ndarray:
-        """
-        Build a per-bar multiplier in [min_reduction, 1.0].
-
-        At a change-point bar the multiplier drops proportionally to
-        the score strength.  After the change point the reduction decays
-        linearly over `score_decay_bars` bars back to 1.0.
-        """
-        reduction = np.ones(n, dtype=float)
-
-        for cp in change_points:
-            # Normalise the score to a 0..1 "strength" using a sigmoid-like
-            # mapping: strength = 1 - 1/(1 + score - threshold)
-            excess = max(0.0, cp.score - self.z_threshold)
-            strength = 1.0 - 1.0 / (1.0 + excess)
-            floor = self.min_reduction + (1.0 - strength) * (1.0 - self.min_reduction)
-
-            for d in range(self.score_decay_bars + 1):
-                idx = cp.bar_index + d
-                if idx >= n:
-                    break
-                # Linear decay from floor → 1.0
-                t = d / max(self.score_decay_bars, 1)
-                value = floor + t * (1.0 - floor)
-                # Take the minimum if overlapping reductions
-                reduction[idx] = min(reduction[idx], value)
-
-        return reduction
+                self._stream = stumpy.stumpi(ts, m, egress=False)
+            self._stream_closes = closes
+            return self._stream.P_.astype(float)
+
+        if self._wants_gpu(len(ts)):
+            try:
+                return stumpy.gpu_stump(ts, m)[:, 0].astype(float)
+            except Exception as exc:
+                logger.warning("stumpy.gpu_stump failed: %s — using CPU.", exc)
+        return stumpy.stump(ts, m)[:, 0].astype(float)
+
+    def _wants_gpu(self, n_ts: int) -> bool:
+        if self.use_gpu is False or not _cuda_available():
+            return False
+        return self.use_gpu or n_ts >= GPU_MIN_LENGTH
 
     def _empty_result(self, n: int) -> MatrixProfileResult:
         """Return a neutral result when analysis cannot be performed."""
@@ -1,8 +1,140 @@
 """Reversal signal detection service."""
 
-from typing import List
+from itertools import pairwise
+from operator import attrgetter
+from typing import List, Optional, Sequence
 
-from ...domain.entities import Pivot, ReversalSignal, SignalState
+import numpy as np
+
+from ._jit import njit
+from ...domain.entities import Pivot, ReversalSignal
+
+
+@njit(cache=True)
+def _detect_kernel(bar_index, is_high, price, price_h, price_l, n_bars,
+                   bar_offset):
+    """
+    Walk pivot-to-pivot segments (pivots sorted by bar) and return the
+    indices of the pivots that produced a reversal signal.
+
+    Direction and the inflection level only change at pivots, so within a
+    segment the signal flips at most once: a low pivot is confirmed by a
+    later confirmed low above it (U1), a high pivot by a later confirmed
+    high below it (D1).  NaN prices never compare true.
+
+    Bar ``i`` reads ``price_h/price_l[i - bar_offset]``; bars before the
+    offset have no confirmed price yet and are skipped.
+    """
+    k_total = bar_index.shape[0]
+    fired = np.empty(k_total, dtype=np.int64)
+    count = 0
+    signal = 0
+    for k in range(k_total):
+        start = max(bar_index[k], 0)
+        if start >= n_bars:
+            break
+        end = min(bar_index[k + 1] if k + 1 < k_total else n_bars, n_bars)
+        if end <= start:
+            continue  # another pivot on the same bar takes over
+        start = max(start, bar_offset)
+
+        if not is_high[k]:
+            if signal <= 0:
+                for i in range(start, end):
+                    if price_l[i - bar_offset] > price[k]:
+                        signal = 1
+                        fired[count] = k
+                        count += 1
+                        break
+        elif signal >= 0:
+            for i in range(start, end):
+                if price_h[i - bar_offset] < price[k]:
+                    signal = -1
+                    fired[count] = k
+                    count += 1
+                    break
+    return fired[:count]
+
+
+def _signal_from(pivot: Pivot) -> ReversalSignal:
+    """The confirmed signal a fired pivot produces."""
+    return ReversalSignal(
+        bar_index=pivot.bar_index,
+        price=pivot.price,
+        actual_price=pivot.actual_price or pivot.price,
+        is_bullish=not pivot.is_high,  # U1 on lows, D1 on highs
+        is_preview=False,
+    )
+
+
+class ReversalDetectorStateful:
+    """
+    Incremental :meth:`ReversalDetector.detect` for live bars.
+
+    Segments before the last pivot are settled once the next pivot
+    arrives.  The last pivot's segment is still open, so its signal stays
+    tentative: a later pivot can end the segment before the bar that fired
+    it, exactly as a batch recompute would.  Each call checks only bars
+    not seen before, plus one bounded rescan per new pivot.
+    """
+
+    def __init__(self, bar_offset: int = 0):
+        self.bar_offset = bar_offset
+        self.settled: List[ReversalSignal] = []
+        self._last: Optional[Pivot] = None
+        self._signal = 0       # signal state entering the last segment
+        self._checked = 0      # bars of the last segment already checked
+        self._tentative: Optional[ReversalSignal] = None
+
+    def _fires(self, pivot: Pivot, start: int, end: int,
+               price_h: Sequence[float], price_l: Sequence[float]) -> bool:
+        """Same U1/D1 test as ``_detect_kernel`` over bars [start, end)."""
+        start = max(start, self.bar_offset)
+        if end <= start:
+            return False
+        lo, hi = start - self.bar_offset, end - self.bar_offset
+        if pivot.is_high:
+            return self._signal >= 0 and bool(
+                (np.asarray(price_h[lo:hi], dtype=np.float64) < pivot.price).any()
+            )
+        return self._signal <= 0 and bool(
+            (np.asarray(price_l[lo:hi], dtype=np.float64) > pivot.price).any()
+        )
+
+    def update(
+        self,
+        n_bars: int,
+        price_h: Sequence[float],
+        price_l: Sequence[float],
+        new_pivot: Optional[Pivot] = None,
+    ) -> List[ReversalSignal]:
+        """
+        Advance to ``n_bars`` bars and return every signal so far.
+
+        ``price_h`` / ``price_l`` hold the confirmed prices of all bars seen
+        (as for :meth:`ReversalDetector.detect`); ``new_pivot`` is the
+        confirmed pivot produced since the last call, if any.
+        """
+        if new_pivot is not None:
+            last = self._last
+            if last is not None and self._fires(
+                last, last.bar_index, new_pivot.bar_index, price_h, price_l
+            ):
+                self.settled.append(_signal_from(last))
+                self._signal = -1 if last.is_high else 1
+            self._last = new_pivot
+            self._checked = new_pivot.bar_index
+            self._tentative = None
+
+        last = self._last
+        if last is not None and self._tentative is None and self._checked < n_bars:
+            if self._fires(last, self._checked, n_bars, price_h, price_l):
+                self._tentative = _signal_from(last)
+            self._checked = n_bars
+
+        if self._tentative is None:
+            return list(self.settled)
+        return self.settled + [self._tentative]
 
 
 class ReversalDetector:
@@ -17,6 +149,7 @@ class ReversalDetector:
         n_bars: int,
         price_h: "np.ndarray",
         price_l: "np.ndarray",
+        bar_offset: int = 0,
     ) -> List[ReversalSignal]:
         """
         Walk through bars and emit reversal signals when direction changes
@@ -28,68 +161,28 @@ class ReversalDetector:
         n_bars   : total number of bars
         price_h  : confirmed high prices (smoothed or raw)
         price_l  : confirmed low prices (smoothed or raw)
+        bar_offset : confirmation delay; bar ``i`` is judged on the prices
+                     of bar ``i - bar_offset``
 
         Returns
         -------
         List of ReversalSignal
         """
-        import numpy as np
-
-        state = SignalState()
-        signals: List[ReversalSignal] = []
-
-        # We need to iterate bars in order, processing pivots as they appear
-        pivot_iter = iter(sorted(pivots, key=lambda p: p.bar_index))
-        next_pivot = next(pivot_iter, None)
-
-        for i in range(n_bars):
-            ph = price_h[i] if not np.isnan(price_h[i]) else None
-            pl = price_l[i] if not np.isnan(price_l[i]) else None
-
-            # Process any pivot on this bar
-            while next_pivot is not None and next_pivot.bar_index <= i:
-                if next_pivot.is_high:
-                    state.eih = next_pivot.price
-                    state.eih_actual = next_pivot.actual_price
-                    state.eih_bar = next_pivot.bar_index
-                    state.dir = -1
-                else:
-                    state.eil = next_pivot.price
-                    state.eil_actual = next_pivot.actual_price
-                    state.eil_bar = next_pivot.bar_index
-                    state.dir = 1
-                next_pivot = next(pivot_iter, None)
-
-            # Signal detection
-            state.prev_signal = state.signal
-
-            if state.dir > 0 and pl is not None and state.eil is not None:
-                if pl > state.eil:
-                    if state.signal <= 0:
-                        state.signal = 1
-            elif state.dir < 0 and ph is not None and state.eih is not None:
-                if ph < state.eih:
-                    if state.signal >= 0:
-                        state.signal = -1
-
-            # U1: bullish reversal onset
-            if state.signal > 0 and state.prev_signal <= 0:
-                signals.append(ReversalSignal(
-                    bar_index=state.eil_bar,
-                    price=state.eil,
-                    actual_price=state.eil_actual or state.eil,
-                    is_bullish=True,
-                    is_preview=False,
-                ))
-
-            # D1: bearish reversal onset
-            if state.signal < 0 and state.prev_signal >= 0:
-                signals.append(ReversalSignal(
-                    bar_index=state.eih_bar,
-                    price=state.eih,
-                    actual_price=state.eih_actual or state.eih,
-                    is_bullish=False,
-                    is_preview=False,
-                ))
-
-        return signals
+        # ZigZag already emits pivots in bar order; only sort when not
+        ordered = pivots
+        if any(a.bar_index > b.bar_index for a, b in pairwise(pivots)):
+            ordered = sorted(pivots, key=attrgetter("bar_index"))
+
+        # Struct-of-arrays view of the pivots for the compiled walk
+        k = len(ordered)
+        fired = _detect_kernel(
+            np.fromiter((p.bar_index for p in ordered), dtype=np.int64, count=k),
+            np.fromiter((p.is_high for p in ordered), dtype=np.bool_, count=k),
+            np.fromiter((p.price for p in ordered), dtype=np.float64, count=k),
+            np.asarray(price_h, dtype=np.float64),
+            np.asarray(price_l, dtype=np.float64),
+            n_bars,
+            bar_offset,
+        )
+
+        return [_signal_from(ordered[idx]) for idx in fired.tolist()]
@@ -25,28 +25,28 @@ class SupplyDemandService:
         - Pivot LOW (is_high=False) => Demand zone (GREEN)
         - Pivot HIGH (is_high=True) => Supply zone (RED)
         """
-        zones: List[SupplyDemandZone] = []
-
-        for pivot in pivots:
+        # Only the last N confirmed pivots survive, so pick them first
+        # (walking back from the end) and build zones for those alone.
+        kept: List[Pivot] = []
+        for pivot in reversed(pivots):
             if pivot.is_preview:
                 continue
+            kept.append(pivot)
+            if len(kept) == self.max_zones:
+                break
+        kept.reverse()
 
-            zone_type = ZoneType.SUPPLY if pivot.is_high else ZoneType.DEMAND
+        zones: List[SupplyDemandZone] = []
+        for pivot in kept:
             center = pivot.actual_price
             half = (center * self.zone_thickness_pct) / 2.0
-
-            zone = SupplyDemandZone(
-                zone_type=zone_type,
+            zones.append(SupplyDemandZone(
+                zone_type=ZoneType.SUPPLY if pivot.is_high else ZoneType.DEMAND,
                 center_price=center,
                 top_price=center + half,
                 bottom_price=center - half,
                 start_bar=pivot.bar_index,
                 end_bar=pivot.bar_index + self.zone_extension_bars,
-            )
-            zones.append(zone)
-
-        # Keep only the last N zones
-        if self.max_zones > 0 and len(zones) > self.max_zones:
-            zones = zones[-self.max_zones:]
+            ))
 
         return zones
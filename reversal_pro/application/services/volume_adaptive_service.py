@@ -22,6 +22,8 @@ References
 
 from __future__ import annotations
 
+from collections import deque
+
 import numpy as np
 
 
@@ -71,17 +73,58 @@ class VolumeAdaptiveService:
         if n < self.lookback + 1:
             return reduction
 
-        # Pre-compute rolling average using a cumulative sum for speed
-        cumvol = np.cumsum(volumes)
-        for i in range(self.lookback, n):
-            avg_vol = (cumvol[i - 1] - (cumvol[i - self.lookback - 1]
-                       if i - self.lookback - 1 >= 0 else 0.0)) / self.lookback
-            if avg_vol <= 0:
-                continue
-
-            ratio = volumes[i] / avg_vol
-            if ratio >= self.volume_spike_mult:
-                strength = min(1.0, (ratio - 1.0) / self.headroom)
-                reduction[i] = 1.0 - strength * (1.0 - self.min_reduction)
+        # Trailing mean of the `lookback` bars before each bar, from one
+        # zero-padded cumulative sum: avg[i] = (cum[i] - cum[i-lookback]) / L
+        volumes = np.asarray(volumes, dtype=float)
+        cumvol = np.concatenate(([0.0], np.cumsum(volumes)))
+        avg_vol = (cumvol[self.lookback:n] - cumvol[:n - self.lookback]) / self.lookback
+
+        # Everything below reuses avg_vol's buffer in place: one float
+        # array and one mask instead of a temporary per operator.
+        spike = avg_vol > 0
+        ratio = np.divide(volumes[self.lookback:], avg_vol, out=avg_vol, where=spike)
+        spike &= ratio >= self.volume_spike_mult
+
+        # ratio → 1 - min(1, (ratio - 1) / headroom) * (1 - min_reduction)
+        np.subtract(ratio, 1.0, out=ratio)
+        np.divide(ratio, self.headroom, out=ratio)
+        np.minimum(ratio, 1.0, out=ratio)
+        np.multiply(ratio, -(1.0 - self.min_reduction), out=ratio)
+        np.add(ratio, 1.0, out=ratio)
+        np.copyto(reduction[self.lookback:], ratio, where=spike)
 
         return reduction
+
+
+class VolumeAdaptiveStateful:
+    """
+    Incremental :meth:`VolumeAdaptiveService.compute_reduction` for live
+    bars.
+
+    Keeps the running volume total and the last ``lookback + 1`` prefix
+    sums, so each :meth:`update` is O(1).  The prefix sums accumulate in
+    the same order as the batch ``np.cumsum``, so the trailing means and
+    therefore the reductions match the batch output exactly.
+    """
+
+    def __init__(self, service: VolumeAdaptiveService):
+        self.service = service
+        self._total = 0.0
+        self._sums: deque = deque(maxlen=service.lookback + 1)
+
+    def update(self, volume: float) -> float:
+        """Feed one bar's volume and return its reduction factor."""
+        svc = self.service
+        self._sums.append(self._total)  # sum of every volume before this bar
+        self._total += volume
+        if len(self._sums) <= svc.lookback:
+            return 1.0
+
+        avg_vol = (self._sums[-1] - self._sums[0]) / svc.lookback
+        if not avg_vol > 0:
+            return 1.0
+        ratio = volume / avg_vol
+        if not ratio >= svc.volume_spike_mult:
+            return 1.0
+        strength = min((ratio - 1.0) / svc.headroom, 1.0)
+        return strength * -(1.0 - svc.min_reduction) + 1.0
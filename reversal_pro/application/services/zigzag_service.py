@@ -1,10 +1,151 @@
 """ZigZag calculation service with confirmation support."""
 
+from math import isnan
+
 import numpy as np
 from typing import List, Optional, Tuple
+from scipy.signal import lfilter
+
+from ._jit import njit
+from ...domain.entities import Pivot
+
+
+# Scan state before the first bar: nothing tracked yet
+_INITIAL_STATE = (0, 0.0, 0.0, 0)
+
+
+@njit(cache=True)
+def _zigzag_scan(price_h, price_l, highs, lows, reversal_amounts, stop,
+                 first_bar, state):
+    """
+    Run the zigzag over array positions ``0 .. stop-1``, which hold bars
+    ``first_bar ..``.
+
+    ``state`` is the extreme being tracked before the first position:
+    ``(direction, price, actual_price, bar)`` with direction 1 = up
+    (tracking a high), -1 = down, 0 = never initialised.  Returns the
+    pivots as parallel arrays (price, actual price, bar index, is_high)
+    plus the state after the last position, so a scan can be resumed.
+    """
+    prices = np.empty(stop)
+    actuals = np.empty(stop)
+    bars = np.empty(stop, dtype=np.int64)
+    is_high = np.empty(stop, dtype=np.bool_)
+    count = 0
+
+    direction, z, z_actual, z_bar = state
+    zhigh = zlow = z
+    zhigh_actual = zlow_actual = z_actual
+    zhigh_bar = zlow_bar = z_bar
+
+    for i in range(stop):
+        ph = price_h[i]
+        pl = price_l[i]
+        rev = reversal_amounts[i]
+        if isnan(ph) or isnan(pl) or isnan(rev):
+            continue
+        bar = first_bar + i
+
+        if direction == 0:
+            zhigh, zhigh_actual, zhigh_bar = ph, highs[i], bar
+            zlow, zlow_actual, zlow_bar = pl, lows[i], bar
+            direction = 1
+            continue
+
+        if direction == 1:
+            if ph > zhigh:
+                zhigh, zhigh_actual, zhigh_bar = ph, highs[i], bar
+            if zhigh - pl >= rev:
+                prices[count] = zhigh
+                actuals[count] = zhigh_actual
+                bars[count] = zhigh_bar
+                is_high[count] = True
+                count += 1
+                direction = -1
+                zlow, zlow_actual, zlow_bar = pl, lows[i], bar
+        else:
+            if pl < zlow:
+                zlow, zlow_actual, zlow_bar = pl, lows[i], bar
+            if ph - zlow >= rev:
+                prices[count] = zlow
+                actuals[count] = zlow_actual
+                bars[count] = zlow_bar
+                is_high[count] = False
+                count += 1
+                direction = 1
+                zhigh, zhigh_actual, zhigh_bar = ph, highs[i], bar
+
+    if direction == 1:
+        tail = (direction, zhigh, zhigh_actual, zhigh_bar)
+    else:
+        tail = (direction, zlow, zlow_actual, zlow_bar)
+    return prices[:count], actuals[:count], bars[:count], is_high[:count], tail
+
+
+def _forming_pivot(state: tuple) -> Optional[Pivot]:
+    """The extreme a scan is still tracking, as a preview pivot."""
+    direction, price, actual, bar = state
+    if direction == 0:
+        return None
+    return Pivot(
+        price=price,
+        actual_price=actual,
+        bar_index=bar,
+        is_high=direction == 1,  # up move → potential top
+        is_preview=True,
+    )
+
+
+class ZigZagStateful:
+    """
+    Incremental zigzag scan for live bars.
+
+    Each :meth:`update` runs the compiled scan over the new bar only,
+    carrying the tracked extreme between calls, so the pivots match
+    :meth:`ZigZagService.compute_pivots` / ``compute_preview_pivots`` over
+    the same bars.  Prices are fed already smoothed (or raw), as
+    :meth:`ZigZagService.prepare_prices` would produce them.
+    """
 
-from ...domain.enums import Direction
-from ...domain.entities import Pivot, ZigZagState
+    def __init__(self, is_preview: bool = False):
+        self.is_preview = is_preview
+        self.pivots: List[Pivot] = []
+        self.bars_seen = 0
+        self._state = _INITIAL_STATE
+
+    def update(
+        self,
+        price_h: float,
+        price_l: float,
+        high: float,
+        low: float,
+        reversal_amount: float,
+    ) -> Optional[Pivot]:
+        """Feed one bar; return the pivot it confirmed, if any."""
+        prices, actuals, bars, is_high, self._state = _zigzag_scan(
+            np.array([price_h], dtype=np.float64),
+            np.array([price_l], dtype=np.float64),
+            np.array([high], dtype=np.float64),
+            np.array([low], dtype=np.float64),
+            np.array([reversal_amount], dtype=np.float64),
+            1, self.bars_seen, self._state,
+        )
+        self.bars_seen += 1
+        if not len(prices):
+            return None
+        pivot = Pivot(
+            price=float(prices[0]),
+            actual_price=float(actuals[0]),
+            bar_index=int(bars[0]),
+            is_high=bool(is_high[0]),
+            is_preview=self.is_preview,
+        )
+        self.pivots.append(pivot)
+        return pivot
+
+    def forming_pivot(self) -> Optional[Pivot]:
+        """The extreme not yet reversed (see ``compute_preview_pivots``)."""
+        return _forming_pivot(self._state)
 
 
 class ZigZagService:
@@ -25,35 +166,104 @@ class ZigZagService:
 
     @staticmethod
     def _ema(data: np.ndarray, period: int) -> np.ndarray:
-        """Simple EMA computation."""
-        n = len(data)
-        result = np.full(n, np.nan)
+        """Simple EMA computation along the last axis (rows are series)."""
+        data = np.asarray(data, dtype=np.float64)
+        n = data.shape[-1]
+        result = np.full(data.shape, np.nan)
         if n == 0 or period <= 0:
             return result
         alpha = 2.0 / (period + 1)
         if n >= period:
-            result[period - 1] = np.mean(data[:period])
-            for i in range(period, n):
-                result[i] = alpha * data[i] + (1.0 - alpha) * result[i - 1]
+            seed = data[..., :period].mean(axis=-1)
+            result[..., period - 1] = seed
+            # Seeded first-order IIR, as in EMAService.ema (but no partial
+            # SMA for short series: those stay all-NaN here)
+            if n > period:
+                decay = 1.0 - alpha
+                result[..., period:] = lfilter(
+                    [alpha], [1.0, -decay], data[..., period:], axis=-1,
+                    zi=(seed * decay)[..., np.newaxis],
+                )[0]
         return result
 
-    def _prepare_prices(
+    def prepare_prices(
         self, highs: np.ndarray, lows: np.ndarray
     ) -> Tuple[np.ndarray, np.ndarray]:
-        """Return smoothed or raw prices depending on method."""
+        """
+        Return smoothed or raw prices depending on method.
+        Compute once and pass to ``compute_pivots`` /
+        ``compute_preview_pivots`` to share them between passes.
+        Raw prices are the inputs themselves (no copy): treat them as
+        read-only.
+        """
         if self.use_ema:
-            price_h = self._ema(highs, self.ema_length)
-            price_l = self._ema(lows, self.ema_length)
-        else:
-            price_h = highs.copy()
-            price_l = lows.copy()
-        return price_h, price_l
+            # One lfilter call over both series
+            price_h, price_l = self._ema(np.stack((highs, lows)), self.ema_length)
+            return price_h, price_l
+        return highs, lows
+
+    def extend_prices(
+        self,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        prices: Tuple[np.ndarray, np.ndarray],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extend ``prices`` from :meth:`prepare_prices` to bars appended to
+        ``highs`` / ``lows`` since it was computed.
+
+        The EMA continues from its last value, so only the new bars are
+        filtered; the result equals ``prepare_prices(highs, lows)``.
+        """
+        price_h, price_l = prices
+        m = len(price_h)
+        period = self.ema_length
+        if not self.use_ema or period <= 0 or m < period or m >= len(highs):
+            # Nothing to continue from (or nothing appended)
+            return self.prepare_prices(highs, lows)
+
+        alpha = 2.0 / (period + 1)
+        decay = 1.0 - alpha
+        extended = []
+        for prev, data in ((price_h, highs), (price_l, lows)):
+            tail = lfilter(
+                [alpha], [1.0, -decay], data[m:], zi=[prev[-1] * decay]
+            )[0]
+            extended.append(np.concatenate((prev, tail)))
+        return extended[0], extended[1]
+
+    def _scan(
+        self,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        reversal_amounts: np.ndarray,
+        stop: int,
+        is_preview: bool,
+        prices: Optional[Tuple[np.ndarray, np.ndarray]],
+    ) -> Tuple[List[Pivot], tuple]:
+        """Run the compiled zigzag and wrap its pivot columns in Pivots."""
+        highs = np.asarray(highs, dtype=np.float64)
+        lows = np.asarray(lows, dtype=np.float64)
+        price_h, price_l = prices if prices is not None else self.prepare_prices(highs, lows)
+        prices, actuals, bars, is_high, tail = _zigzag_scan(
+            price_h, price_l, highs, lows,
+            np.asarray(reversal_amounts, dtype=np.float64), max(stop, 0),
+            0, _INITIAL_STATE,
+        )
+        pivots = [
+            Pivot(price=p, actual_price=a, bar_index=b, is_high=h,
+                  is_preview=is_preview)
+            for p, a, b, h in zip(prices.tolist(), actuals.tolist(),
+                                  bars.tolist(), is_high.tolist())
+        ]
+        return pivots, tail
 
     def compute_pivots(
         self,
         highs: np.ndarray,
         lows: np.ndarray,
         reversal_amounts: np.ndarray,
+        prices: Optional[Tuple[np.ndarray, np.ndarray]] = None,
     ) -> List[Pivot]:
         """
         Run the zigzag algorithm over all bars.
@@ -64,79 +274,14 @@ class ZigZagService:
         highs : raw high prices
         lows  : raw low prices
         reversal_amounts : reversal threshold per bar
+        prices : optional ``prepare_prices(highs, lows)`` result to reuse
         """
-        n = len(highs)
-        price_h, price_l = self._prepare_prices(highs, lows)
-        cb = self.confirmation_bars
-
-        state = ZigZagState()
-        pivots: List[Pivot] = []
-
-        for i in range(n):
-            # Index of the confirmed bar
-            ci = i - cb
-            if ci < 0:
-                continue
-
-            ph = price_h[ci]
-            pl = price_l[ci]
-            ah = highs[ci]
-            al = lows[ci]
-
-            if np.isnan(ph) or np.isnan(pl):
-                continue
-
-            rev = reversal_amounts[ci]
-            if np.isnan(rev):
-                continue
-
-            # Initialize
-            if state.direction == Direction.NONE:
-                state.zhigh = ph
-                state.zlow = pl
-                state.zhigh_actual = ah
-                state.zlow_actual = al
-                state.zhigh_bar = ci
-                state.zlow_bar = ci
-                state.direction = Direction.UP
-                continue
-
-            if state.direction == Direction.UP:
-                if ph > state.zhigh:
-                    state.zhigh = ph
-                    state.zhigh_actual = ah
-                    state.zhigh_bar = ci
-
-                if state.zhigh - pl >= rev:
-                    pivots.append(Pivot(
-                        price=state.zhigh,
-                        actual_price=state.zhigh_actual,
-                        bar_index=state.zhigh_bar,
-                        is_high=True,
-                    ))
-                    state.direction = Direction.DOWN
-                    state.zlow = pl
-                    state.zlow_actual = al
-                    state.zlow_bar = ci
-
-            elif state.direction == Direction.DOWN:
-                if pl < state.zlow:
-                    state.zlow = pl
-                    state.zlow_actual = al
-                    state.zlow_bar = ci
-
-                if ph - state.zlow >= rev:
-                    pivots.append(Pivot(
-                        price=state.zlow,
-                        actual_price=state.zlow_actual,
-                        bar_index=state.zlow_bar,
-                        is_high=False,
-                    ))
-                    state.direction = Direction.UP
-                    state.zhigh = ph
-                    state.zhigh_actual = ah
-                    state.zhigh_bar = ci
-
+        # Bar i only sees the bar confirmation_bars behind it, so the
+        # last confirmation_bars bars are never confirmed yet.
+        pivots, _ = self._scan(
+            highs, lows, reversal_amounts,
+            len(highs) - self.confirmation_bars, is_preview=False, prices=prices,
+        )
         return pivots
 
     def compute_preview_pivots(
@@ -144,100 +289,23 @@ class ZigZagService:
         highs: np.ndarray,
         lows: np.ndarray,
         reversal_amounts: np.ndarray,
+        prices: Optional[Tuple[np.ndarray, np.ndarray]] = None,
     ) -> List[Pivot]:
         """
         Preview zigzag (no confirmation delay) — may repaint.
-        Used only in preview modes.
+        Used only in preview modes.  ``prices`` as in ``compute_pivots``.
         """
-        n = len(highs)
-        price_h, price_l = self._prepare_prices(highs, lows)
-
-        zhigh = None
-        zlow = None
-        zhigh_actual = None
-        zlow_actual = None
-        zhigh_bar = 0
-        zlow_bar = 0
-        direction = 0
-        previews: List[Pivot] = []
-
-        for i in range(n):
-            ph = price_h[i]
-            pl = price_l[i]
-            if np.isnan(ph) or np.isnan(pl):
-                continue
-
-            rev = reversal_amounts[i]
-            if np.isnan(rev):
-                continue
-
-            if zhigh is None:
-                zhigh = ph
-                zlow = pl
-                zhigh_actual = highs[i]
-                zlow_actual = lows[i]
-                zhigh_bar = i
-                zlow_bar = i
-                direction = 1
-                continue
-
-            if direction == 1:
-                if ph > zhigh:
-                    zhigh = ph
-                    zhigh_actual = highs[i]
-                    zhigh_bar = i
-                if zhigh - pl >= rev:
-                    previews.append(Pivot(
-                        price=zhigh,
-                        actual_price=zhigh_actual,
-                        bar_index=zhigh_bar,
-                        is_high=True,
-                        is_preview=True,
-                    ))
-                    direction = -1
-                    zlow = pl
-                    zlow_actual = lows[i]
-                    zlow_bar = i
-
-            elif direction == -1:
-                if pl < zlow:
-                    zlow = pl
-                    zlow_actual = lows[i]
-                    zlow_bar = i
-                if ph - zlow >= rev:
-                    previews.append(Pivot(
-                        price=zlow,
-                        actual_price=zlow_actual,
-                        bar_index=zlow_bar,
-                        is_high=False,
-                        is_preview=True,
-                    ))
-                    direction = 1
-                    zhigh = ph
-                    zhigh_actual = highs[i]
-                    zhigh_bar = i
+        previews, tail = self._scan(
+            highs, lows, reversal_amounts, len(highs), is_preview=True,
+            prices=prices,
+        )
 
         # Append the *last potential pivot* — the extreme currently being
         # tracked that has not yet reversed.  This is the key difference
         # with confirmed pivots: preview shows the forming top/bottom
         # before the reversal threshold is hit.
-        if direction == 1 and zhigh is not None:
-            # Tracking an upward move → potential top
-            previews.append(Pivot(
-                price=zhigh,
-                actual_price=zhigh_actual,
-                bar_index=zhigh_bar,
-                is_high=True,
-                is_preview=True,
-            ))
-        elif direction == -1 and zlow is not None:
-            # Tracking a downward move → potential bottom
-            previews.append(Pivot(
-                price=zlow,
-                actual_price=zlow_actual,
-                bar_index=zlow_bar,
-                is_high=False,
-                is_preview=True,
-            ))
+        forming = _forming_pivot(tail)
+        if forming is not None:
+            previews.append(forming)
 
         return previews
@@ -4,7 +4,7 @@ Orchestrates all services to produce a complete AnalysisResult.
 """
 
 import numpy as np
-from typing import List, Optional
+from typing import List, Optional, Union
 import logging
 
 from ...domain.entities import (
@@ -16,9 +16,10 @@ from ...domain.enums import (
     SensitivityPreset,
     CalculationMethod,
 )
-from ...domain.value_objects import SensitivityConfig, OHLCVBar
+from ...domain.value_objects import SensitivityConfig, OHLCVBar, BarSeries
 
 from ..services.atr_service import ATRService
+from ..services.bar_features import compute_bar_features
 from ..services.ema_service import EMAService
 from ..services.zigzag_service import ZigZagService
 from ..services.reversal_detector import ReversalDetector
@@ -175,13 +176,15 @@ class DetectReversalsUseCase:
                 decay_bars=cusum_decay_bars,
             )
 
-    def execute(self, bars: List[OHLCVBar]) -> AnalysisResult:
+    def execute(self, bars: Union[List[OHLCVBar], BarSeries]) -> AnalysisResult:
         """
-        Run the full analysis pipeline on a list of OHLCV bars.
+        Run the full analysis pipeline on OHLCV bars.
 
         Parameters
         ----------
-        bars : list of OHLCVBar, ordered chronologically
+        bars : list of OHLCVBar, or a BarSeries of the same bars (reuse a
+               prebuilt series to skip per-call column extraction);
+               ordered chronologically
 
         Returns
         -------
@@ -190,25 +193,30 @@ class DetectReversalsUseCase:
         if not bars:
             return AnalysisResult()
 
+        if not isinstance(bars, BarSeries):
+            bars = BarSeries.from_bars(bars)
         n = len(bars)
-        opens = np.array([b.open for b in bars], dtype=float)
-        highs = np.array([b.high for b in bars], dtype=float)
-        lows = np.array([b.low for b in bars], dtype=float)
-        closes = np.array([b.close for b in bars], dtype=float)
-        volumes = np.array([b.volume for b in bars], dtype=float)
-
-        # ── Step 1: ATR ──────────────────────────────────────────────
+        opens = bars.opens
+        highs = bars.highs
+        lows = bars.lows
+        closes = bars.closes
+        volumes = bars.volumes
+
+        # ── Step 1: Bar features + ATR ───────────────────────────────
+        # Range/body/true-range arrays are built once and shared by the
+        # ATR and candle-pattern steps.
+        features = compute_bar_features(opens, highs, lows, closes)
         atr_values = self.atr_service.atr(
-            highs, lows, closes, self.atr_length
+            highs, lows, closes, self.atr_length, features=features
         )
 
         # ── Step 2: Reversal thresholds (vectorized) ────────────
-        pct_amounts = closes * self.sensitivity_config.percent_threshold / 100.0
-        atr_safe = np.nan_to_num(atr_values, nan=0.0)
-        atr_amounts = self.sensitivity_config.atr_multiplier * atr_safe
-        reversal_amounts = np.maximum(
-            pct_amounts,
-            np.maximum(self.absolute_reversal, atr_amounts),
+        reversal_amounts = self.atr_service.compute_reversal_thresholds(
+            closes,
+            self.sensitivity_config.percent_threshold,
+            self.absolute_reversal,
+            self.sensitivity_config.atr_multiplier,
+            atr_values,
         )
 
         # ── Step 2b: Matrix Profile regime-change detection ──────────
@@ -225,7 +233,7 @@ class DetectReversalsUseCase:
                 mp_enabled = True
 
                 # Apply per-bar threshold reduction
-                reversal_amounts = reversal_amounts * mp_result.threshold_reduction
+                reversal_amounts *= mp_result.threshold_reduction
 
                 # Convert change points to early-warning signals.
                 # We infer direction from the local price trend around
@@ -256,16 +264,16 @@ class DetectReversalsUseCase:
         # so we can confirm it with a lower reversal threshold.
         if self.volume_adaptive_service is not None:
             va_reduction = self.volume_adaptive_service.compute_reduction(volumes)
-            reversal_amounts = reversal_amounts * va_reduction
+            reversal_amounts *= va_reduction
 
         # ── Step 2d: Candlestick pattern threshold reduction ─────────
         # Classic reversal patterns (engulfing, hammer, doji) allow
         # earlier pivot confirmation by 1–3 candles.
         if self.candle_pattern_service is not None:
             cp_reduction = self.candle_pattern_service.compute_reduction(
-                opens, highs, lows, closes
+                opens, highs, lows, closes, features=features
             )
-            reversal_amounts = reversal_amounts * cp_reduction
+            reversal_amounts *= cp_reduction
 
         # ── Step 2e: CUSUM change-point threshold reduction ──────────
         # Accumulates small deviations to detect structural shifts
@@ -274,76 +282,61 @@ class DetectReversalsUseCase:
             cusum_reduction = self.cusum_service.compute_reduction(
                 closes, atr_values
             )
-            reversal_amounts = reversal_amounts * cusum_reduction
+            reversal_amounts *= cusum_reduction
 
         # ── Step 3: ZigZag pivots ────────────────────────────────────
+        # Smoothed (or raw) prices are shared by both zigzag passes and
+        # the signal detection below.
+        prices = self.zigzag_service.prepare_prices(highs, lows)
         confirmed_pivots: List[Pivot] = []
         preview_pivots: List[Pivot] = []
 
         if self.signal_mode != SignalMode.PREVIEW_ONLY:
             confirmed_pivots = self.zigzag_service.compute_pivots(
-                highs, lows, reversal_amounts
+                highs, lows, reversal_amounts, prices=prices
             )
 
         if self.signal_mode != SignalMode.CONFIRMED_ONLY:
             preview_pivots = self.zigzag_service.compute_preview_pivots(
-                highs, lows, reversal_amounts
+                highs, lows, reversal_amounts, prices=prices
             )
 
-        all_pivots = confirmed_pivots + preview_pivots
-
         # ── Step 4: Reversal signals ─────────────────────────────────
-        # Prepare confirmed prices for signal detection
-        use_ema = self.calculation_method == CalculationMethod.AVERAGE
-        if use_ema:
-            price_h = ZigZagService._ema(highs, self.average_length)
-            price_l = ZigZagService._ema(lows, self.average_length)
-        else:
-            price_h = highs.copy()
-            price_l = lows.copy()
-
-        # Apply confirmation bar delay
-        if self.confirmation_bars > 0:
-            cb = self.confirmation_bars
-            ph_conf = np.full(n, np.nan)
-            pl_conf = np.full(n, np.nan)
-            ph_conf[cb:] = price_h[:n - cb]
-            pl_conf[cb:] = price_l[:n - cb]
-        else:
-            ph_conf = price_h
-            pl_conf = price_l
-
-        confirmed_signals = self.reversal_detector.detect(
-            confirmed_pivots, n, ph_conf, pl_conf
-        )
+        # Confirmed signals and zones both derive from confirmed pivots,
+        # so preview-only runs skip them.
+        confirmed_signals: List[ReversalSignal] = []
+        if self.signal_mode != SignalMode.PREVIEW_ONLY:
+            price_h, price_l = prices
+            # Confirmation bar delay is applied as an index offset inside
+            # the detector instead of materialising shifted copies
+            confirmed_signals = self.reversal_detector.detect(
+                confirmed_pivots, n, price_h, price_l,
+                bar_offset=self.confirmation_bars,
+            )
 
         # Preview signals — convert preview pivots directly into signals.
         # Unlike confirmed signals which require U1/D1 price confirmation,
         # preview signals mirror the Pine Script behaviour: each pivot IS
         # the signal (pivot high → bearish preview, pivot low → bullish).
-        preview_signals: List[ReversalSignal] = []
-        if self.signal_mode != SignalMode.CONFIRMED_ONLY and preview_pivots:
-            for p in preview_pivots:
-                preview_signals.append(ReversalSignal(
-                    bar_index=p.bar_index,
-                    price=p.price,
-                    actual_price=p.actual_price,
-                    is_bullish=not p.is_high,  # high pivot → bearish, low → bullish
-                    is_preview=True,
-                ))
-
-        all_signals = confirmed_signals + preview_signals
+        # Both signal lists are freshly built here, so append in place
+        all_signals = confirmed_signals
+        all_signals.extend(ReversalSignal.from_pivots(preview_pivots))
 
         # ── Step 5: Supply/Demand zones ──────────────────────────────
         zones: List[SupplyDemandZone] = []
-        if self.generate_zones_flag:
+        if self.generate_zones_flag and self.signal_mode != SignalMode.PREVIEW_ONLY:
             zones = self.supply_demand_service.generate_zones(confirmed_pivots)
 
+        # Confirmed pivots are not needed on their own past this point
+        all_pivots = confirmed_pivots
+        all_pivots.extend(preview_pivots)
+
         # ── Step 6: EMA trend ────────────────────────────────────────
-        trends, ema_state = self.ema_service.compute_trend(
+        trend_columns, _ = self.ema_service.compute_trend_arrays(
             closes, highs, lows,
             self.ema_fast, self.ema_mid, self.ema_slow,
         )
+        trends = self.ema_service.trend_infos(trend_columns)
 
         # ── Build result ─────────────────────────────────────────────
         last_atr = atr_values[-1] if not np.isnan(atr_values[-1]) else 0.0
@@ -360,4 +353,5 @@ class DetectReversalsUseCase:
             atr_multiplier=self.sensitivity_config.atr_multiplier,
             regime_change_signals=regime_change_signals,
             mp_enabled=mp_enabled,
+            trend_columns=trend_columns,
         )
@@ -0,0 +1,221 @@
+"""
+Use case: Stream Reversals
+Incremental counterpart of DetectReversalsUseCase for live bars.
+"""
+
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from ...domain.entities import AnalysisResult, ReversalSignal, TrendInfo
+from ...domain.enums import SignalMode
+from ...domain.value_objects import OHLCVBar
+
+from ..services.atr_service import ATRStateful
+from ..services.bar_features import compute_bar_features
+from ..services.cusum_service import CUSUMStateful
+from ..services.ema_service import EMAStateful
+from ..services.reversal_detector import ReversalDetectorStateful
+from ..services.volume_adaptive_service import VolumeAdaptiveStateful
+from ..services.zigzag_service import ZigZagStateful
+from .detect_reversals import DetectReversalsUseCase
+
+
+class StreamingDetectReversals:
+    """
+    Feed bars one at a time and get the AnalysisResult that
+    ``use_case.execute`` would return for every bar pushed so far.
+
+    Each stage keeps its running state (ATR, threshold reductions, zigzag
+    smoothing and scans, signal detection, EMA trend) and processes only
+    the new bar, so advancing the pipeline is O(1) per bar instead of a
+    re-run over the whole history.  Building the AnalysisResult still
+    copies the signal, pivot and trend lists and regenerates the zones,
+    which is O(history): :meth:`extend` builds it once for a batch of
+    bars, and :meth:`push` once per bar.
+
+    Limitations:
+    - Matrix Profile normalises over the whole series and has no
+      incremental form; the use case must have it disabled.
+    - While fewer bars than the longest EMA length have been pushed, the
+      batch EMA seeds the last bar with a partial SMA, so the trend of
+      that bar can differ.  From then on the results are identical.
+    """
+
+    def __init__(self, use_case: DetectReversalsUseCase):
+        if use_case.use_matrix_profile:
+            raise ValueError(
+                "Matrix Profile cannot be streamed; build the use case "
+                "with use_matrix_profile=False"
+            )
+        self.use_case = use_case
+        uc = use_case
+
+        self._atr = ATRStateful(uc.atr_length)
+        self._va = (VolumeAdaptiveStateful(uc.volume_adaptive_service)
+                    if uc.volume_adaptive_service is not None else None)
+        self._cusum = (CUSUMStateful(uc.cusum_service)
+                       if uc.cusum_service is not None else None)
+        self._trend = EMAStateful(uc.ema_fast, uc.ema_mid, uc.ema_slow)
+
+        self._confirmed = (ZigZagStateful()
+                           if uc.signal_mode != SignalMode.PREVIEW_ONLY else None)
+        self._preview = (ZigZagStateful(is_preview=True)
+                         if uc.signal_mode != SignalMode.CONFIRMED_ONLY else None)
+        self._detector = ReversalDetectorStateful(bar_offset=uc.confirmation_bars)
+
+        # Per-bar history read by the lagging confirmed scan and the detector
+        self._highs: List[float] = []
+        self._lows: List[float] = []
+        self._price_h: List[float] = []
+        self._price_l: List[float] = []
+        self._reversal_amounts: List[float] = []
+        self._trends: List[TrendInfo] = []
+        self._confirmed_signals: List[ReversalSignal] = []
+        self._prev_bar: Optional[OHLCVBar] = None
+
+        # ZigZag EMA smoothing: raw values until seeded, then the last pair
+        self._smooth_seed_h: List[float] = []
+        self._smooth_seed_l: List[float] = []
+        self._smoothed: Optional[tuple] = None
+
+    @property
+    def bars_seen(self) -> int:
+        return len(self._highs)
+
+    def _smooth(self, high: float, low: float) -> tuple:
+        """One bar of ``ZigZagService.prepare_prices``."""
+        zigzag = self.use_case.zigzag_service
+        if not zigzag.use_ema:
+            return high, low
+        period = zigzag.ema_length
+        if self._smoothed is not None:
+            alpha = 2.0 / (period + 1)
+            decay = 1.0 - alpha
+            ph, pl = self._smoothed
+            self._smoothed = (decay * ph + alpha * high, decay * pl + alpha * low)
+            return self._smoothed
+        if period > 0:
+            self._smooth_seed_h.append(high)
+            self._smooth_seed_l.append(low)
+            if len(self._smooth_seed_h) == period:
+                self._smoothed = (float(np.mean(self._smooth_seed_h)),
+                                  float(np.mean(self._smooth_seed_l)))
+                self._smooth_seed_h = []
+                self._smooth_seed_l = []
+                return self._smoothed
+        return np.nan, np.nan
+
+    def _advance(self, bar: OHLCVBar) -> None:
+        uc = self.use_case
+        high, low, close = float(bar.high), float(bar.low), float(bar.close)
+
+        # ── Step 1: Bar features + ATR ───────────────────────────────
+        # Every feature of a bar depends on it and the previous bar only
+        window = (bar,) if self._prev_bar is None else (self._prev_bar, bar)
+        opens = np.array([b.open for b in window], dtype=float)
+        highs = np.array([b.high for b in window], dtype=float)
+        lows = np.array([b.low for b in window], dtype=float)
+        closes = np.array([b.close for b in window], dtype=float)
+        features = compute_bar_features(opens, highs, lows, closes)
+        atr = self._atr.update(float(features.tr[-1]))
+        self._prev_bar = bar
+
+        # ── Step 2: Reversal threshold and reductions (batch order) ──
+        threshold = uc.atr_service.compute_reversal_threshold(
+            close,
+            uc.sensitivity_config.percent_threshold,
+            uc.absolute_reversal,
+            uc.sensitivity_config.atr_multiplier,
+            0.0 if atr != atr else atr,
+        )
+        if self._va is not None:
+            threshold *= self._va.update(float(bar.volume))
+        if uc.candle_pattern_service is not None:
+            threshold *= float(uc.candle_pattern_service.compute_reduction(
+                opens, highs, lows, closes, features=features
+            )[-1])
+        if self._cusum is not None:
+            threshold *= self._cusum.update(close, atr)
+
+        # ── Step 3: ZigZag pivots ────────────────────────────────────
+        ph, pl = self._smooth(high, low)
+        self._highs.append(high)
+        self._lows.append(low)
+        self._price_h.append(ph)
+        self._price_l.append(pl)
+        self._reversal_amounts.append(threshold)
+        n = len(self._highs)
+
+        if self._confirmed is not None:
+            # The confirmed scan lags confirmation_bars behind the tip
+            new_pivot = None
+            j = n - 1 - uc.confirmation_bars
+            if j >= 0:
+                new_pivot = self._confirmed.update(
+                    self._price_h[j], self._price_l[j],
+                    self._highs[j], self._lows[j], self._reversal_amounts[j],
+                )
+            # ── Step 4: Reversal signals ─────────────────────────────
+            self._confirmed_signals = self._detector.update(
+                n, self._price_h, self._price_l, new_pivot
+            )
+
+        if self._preview is not None:
+            self._preview.update(ph, pl, high, low, threshold)
+
+        # ── Step 6: EMA trend ────────────────────────────────────────
+        self._trends.append(self._trend.update(close, high, low))
+
+    def result(self) -> AnalysisResult:
+        """
+        The AnalysisResult for every bar pushed so far.  Built from the
+        running state on each call (O(history) list copies, no pipeline
+        work).
+        """
+        if not self._highs:
+            return AnalysisResult()
+        uc = self.use_case
+
+        confirmed_pivots = self._confirmed.pivots if self._confirmed else []
+        preview_pivots = []
+        if self._preview is not None:
+            preview_pivots = list(self._preview.pivots)
+            forming = self._preview.forming_pivot()
+            if forming is not None:
+                preview_pivots.append(forming)
+
+        signals = list(self._confirmed_signals)
+        signals.extend(ReversalSignal.from_pivots(preview_pivots))
+
+        # ── Step 5: Supply/Demand zones ──────────────────────────────
+        zones = []
+        if uc.generate_zones_flag and uc.signal_mode != SignalMode.PREVIEW_ONLY:
+            zones = uc.supply_demand_service.generate_zones(confirmed_pivots)
+
+        atr = self._atr.value
+        return AnalysisResult(
+            signals=signals,
+            pivots=confirmed_pivots + preview_pivots,
+            zones=zones,
+            trend_history=list(self._trends),
+            current_trend=self._trends[-1],
+            current_atr=0.0 if atr != atr else atr,
+            current_threshold=self._reversal_amounts[-1],
+            atr_multiplier=uc.sensitivity_config.atr_multiplier,
+        )
+
+    def push(self, bar: OHLCVBar) -> AnalysisResult:
+        """
+        Feed one closed bar and return the updated result.  Use
+        :meth:`extend` to feed several bars without building a result
+        for each.
+        """
+        self._advance(bar)
+        return self.result()
+
+    def extend(self, bars: Iterable[OHLCVBar]) -> AnalysisResult:
+        """Feed several bars (e.g. history on start-up), building one result."""
+        for bar in bars:
+            self._advance(bar)
+        return self.result()
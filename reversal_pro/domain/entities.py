@@ -1,12 +1,14 @@
 """Domain entities for the Reversal Detection Pro system."""
 
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+import numpy as np
 
 from .enums import Direction, TrendState, ZoneType
 
 
-@dataclass
+@dataclass(slots=True)
 class Pivot:
     """A confirmed or preview pivot point."""
     price: float
@@ -16,7 +18,7 @@ class Pivot:
     is_preview: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ReversalSignal:
     """A confirmed reversal signal (bullish or bearish)."""
     bar_index: int
@@ -25,6 +27,16 @@ class ReversalSignal:
     is_bullish: bool
     is_preview: bool = False
 
+    @classmethod
+    def from_pivots(cls, pivots: List[Pivot]) -> List["ReversalSignal"]:
+        """Preview signals: each pivot is its own signal (high → bearish)."""
+        # Positional: keyword binding costs ~1/3 of the construction time
+        # (bar_index, price, actual_price, is_bullish, is_preview)
+        return [
+            cls(p.bar_index, p.price, p.actual_price, not p.is_high, True)
+            for p in pivots
+        ]
+
     @property
     def label(self) -> str:
         return "REVERSAL" if not self.is_preview else "PREVIEW"
@@ -45,7 +57,7 @@ class SupplyDemandZone:
     end_bar: int
 
 
-@dataclass
+@dataclass(slots=True)
 class TrendInfo:
     """Current EMA trend information."""
     state: TrendState
@@ -127,3 +139,8 @@ class AnalysisResult:
     # Matrix Profile early-warning signals
     regime_change_signals: List[RegimeChangeSignal] = field(default_factory=list)
     mp_enabled: bool = False
+    # Column form of trend_history (EMAService.compute_trend_arrays),
+    # None when the producer did not keep it
+    trend_columns: Optional[Dict[str, np.ndarray]] = field(
+        default=None, repr=False, compare=False
+    )
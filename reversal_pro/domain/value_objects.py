@@ -1,7 +1,10 @@
 """Value objects for the Reversal Detection Pro system."""
 
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional
+
+import numpy as np
 
 from .enums import SensitivityPreset
 
@@ -58,9 +61,11 @@ class SensitivityConfig:
     percent_threshold: float
 
     @classmethod
+    @lru_cache(maxsize=128)
     def from_preset(
         cls, preset: SensitivityPreset, timeframe: str = "1h"
     ) -> "SensitivityConfig":
+        # Frozen, so one shared instance per (preset, timeframe) is safe
         if preset == SensitivityPreset.CUSTOM:
             raise ValueError("Use from_custom() for custom presets")
         base_mult = SENSITIVITY_ATR_MULTIPLIERS[preset]
@@ -80,7 +85,7 @@ class SensitivityConfig:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OHLCVBar:
     """Single OHLCV price bar."""
     timestamp: object  # datetime, str, or numeric timestamp
@@ -91,4 +96,32 @@ class OHLCVBar:
     volume: float = 0.0
 
 
+@dataclass(frozen=True, eq=False)
+class BarSeries:
+    """
+    Column (struct-of-arrays) view of a bar sequence: one contiguous
+    float64 array per OHLCV field.  Build it once and pass it to
+    ``DetectReversalsUseCase.execute`` to skip per-call extraction.
+    """
+    timestamps: List[object]
+    opens: np.ndarray
+    highs: np.ndarray
+    lows: np.ndarray
+    closes: np.ndarray
+    volumes: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.closes)
 
+    @classmethod
+    def from_bars(cls, bars: List[OHLCVBar]) -> "BarSeries":
+        # One comprehension per field measured faster than np.fromiter
+        # or a single loop filling preallocated buffers
+        return cls(
+            timestamps=[b.timestamp for b in bars],
+            opens=np.array([b.open for b in bars], dtype=float),
+            highs=np.array([b.high for b in bars], dtype=float),
+            lows=np.array([b.low for b in bars], dtype=float),
+            closes=np.array([b.close for b in bars], dtype=float),
+            volumes=np.array([b.volume for b in bars], dtype=float),
+        )
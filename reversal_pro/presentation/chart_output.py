@@ -2,6 +2,8 @@
 
 from typing import Dict, List, Optional
 
+import numpy as np
+
 from ..domain.entities import AnalysisResult, ReversalSignal, SupplyDemandZone
 from ..domain.enums import ZoneType, TrendState
 from ..domain.value_objects import OHLCVBar
@@ -94,9 +96,16 @@ def plot_chart(
 
     # ── EMAs ─────────────────────────────────────────────────────
     if result.trend_history:
-        ema9 = [t.ema_fast for t in result.trend_history]
-        ema14 = [t.ema_mid for t in result.trend_history]
-        ema21 = [t.ema_slow for t in result.trend_history]
+        if result.trend_columns is not None:
+            # Same 0.0 warm-up values as trend_history
+            cols = result.trend_columns
+            ema9 = np.nan_to_num(cols["ema_fast"], nan=0.0)
+            ema14 = np.nan_to_num(cols["ema_mid"], nan=0.0)
+            ema21 = np.nan_to_num(cols["ema_slow"], nan=0.0)
+        else:
+            ema9 = [t.ema_fast for t in result.trend_history]
+            ema14 = [t.ema_mid for t in result.trend_history]
+            ema21 = [t.ema_slow for t in result.trend_history]
         ax.plot(indices, ema9, color=CHART_THEME["ema_fast_color"], linewidth=CHART_THEME["ema_width"], alpha=CHART_THEME["ema_alpha"], label="EMA 9")
         ax.plot(indices, ema14, color=CHART_THEME["ema_mid_color"], linewidth=CHART_THEME["ema_width"], alpha=CHART_THEME["ema_alpha"], label="EMA 14")
         ax.plot(indices, ema21, color=CHART_THEME["ema_slow_color"], linewidth=CHART_THEME["ema_width"], alpha=CHART_THEME["ema_alpha"], label="EMA 21")
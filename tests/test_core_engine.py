@@ -8,7 +8,9 @@ import numpy as np
 import pytest
 
 from reversal_pro.application.services.atr_service import ATRService
-from reversal_pro.application.services.ema_service import EMAService
+from reversal_pro.application.services.bar_features import compute_bar_features
+from reversal_pro.application.services.candle_pattern_service import CandlePatternService
+from reversal_pro.application.services.ema_service import EMAService, EMAStateful
 from reversal_pro.application.services.zigzag_service import ZigZagService
 from reversal_pro.application.services.reversal_detector import ReversalDetector
 from reversal_pro.application.services.supply_demand_service import SupplyDemandService
@@ -36,6 +38,14 @@ class TestATRService:
         assert tr[2] == pytest.approx(2.0)  # max(2, |14-12|, |12-12|) = 2
         assert tr[3] == pytest.approx(2.0)  # max(2, |13.5-13|, |11.5-13|) = 2
 
+    def test_true_range_gaps_use_prev_close(self):
+        highs = np.array([12.0, 16.0, 9.0])
+        lows = np.array([10.0, 15.0, 8.0])
+        closes = np.array([11.0, 15.5, 8.5])
+        tr = ATRService.true_range(highs, lows, closes)
+        assert tr[1] == pytest.approx(5.0)  # gap up: |16-11|
+        assert tr[2] == pytest.approx(7.5)  # gap down: |8-15.5|
+
     def test_atr_period(self):
         highs = np.array([12., 13., 14., 13.5, 15., 14.5, 16., 15.5, 17., 16.5])
         lows = np.array([10., 11., 12., 11.5, 13., 12.5, 14., 13.5, 15., 14.5])
@@ -51,6 +61,44 @@ class TestATRService:
             assert not np.isnan(atr_vals[i])
             assert atr_vals[i] > 0
 
+    def test_atr_matches_wilder_recursion(self):
+        rng = np.random.default_rng(7)
+        closes = 100 + np.cumsum(rng.normal(0, 1, 200))
+        highs = closes + rng.uniform(0.1, 2.0, 200)
+        lows = closes - rng.uniform(0.1, 2.0, 200)
+        period = 14
+
+        atr_vals = ATRService.atr(highs, lows, closes, period=period)
+
+        tr = ATRService.true_range(highs, lows, closes)
+        expected = np.full(200, np.nan)
+        expected[period - 1] = tr[:period].mean()
+        for i in range(period, 200):
+            expected[i] = (expected[i - 1] * (period - 1) + tr[i]) / period
+        np.testing.assert_allclose(atr_vals, expected, rtol=1e-12)
+
+    def test_bar_features_match_service_outputs(self):
+        rng = np.random.default_rng(3)
+        closes = 100 + np.cumsum(rng.normal(0, 1, 100))
+        opens = closes + rng.normal(0, 0.5, 100)
+        highs = np.maximum(opens, closes) + rng.uniform(0, 1, 100)
+        lows = np.minimum(opens, closes) - rng.uniform(0, 1, 100)
+
+        features = compute_bar_features(opens, highs, lows, closes)
+
+        np.testing.assert_array_equal(
+            features.tr, ATRService.true_range(highs, lows, closes)
+        )
+        np.testing.assert_array_equal(
+            ATRService.atr(highs, lows, closes, 5, features=features),
+            ATRService.atr(highs, lows, closes, 5),
+        )
+        svc = CandlePatternService()
+        np.testing.assert_array_equal(
+            svc.compute_reduction(opens, highs, lows, closes, features=features),
+            svc.compute_reduction(opens, highs, lows, closes),
+        )
+
     def test_atr_insufficient_data(self):
         highs = np.array([12., 13.])
         lows = np.array([10., 11.])
@@ -101,6 +149,18 @@ class TestATRService:
         # max(0.0001, max(10, 0.2)) = 10
         assert result == pytest.approx(10.0)
 
+    def test_reversal_thresholds_match_scalar(self):
+        closes = np.array([50000.0, 100.0, 1.0, 200.0])
+        atr_vals = np.array([1.0, 50.0, 0.1, np.nan])
+        result = ATRService.compute_reversal_thresholds(
+            closes, 0.01, 0.5, 2.0, atr_vals,
+        )
+        expected = [
+            ATRService.compute_reversal_threshold(c, 0.01, 0.5, 2.0, a)
+            for c, a in zip(closes, np.nan_to_num(atr_vals, nan=0.0))
+        ]
+        np.testing.assert_array_equal(result, expected)
+
 
 # ╔══════════════════════════════════════════════════════════════╗
 # ║  EMAService                                                  ║
@@ -154,6 +214,52 @@ class TestEMAService:
         assert len(trends) == n
         assert trends[-1].state == TrendState.BEARISH
 
+    def test_trend_arrays_match_trend_info(self):
+        rng = np.random.default_rng(11)
+        closes = 100 + np.cumsum(rng.normal(0, 1, 150))
+        highs = closes + rng.uniform(0.1, 1.0, 150)
+        lows = closes - rng.uniform(0.1, 1.0, 150)
+
+        trends, state = EMAService.compute_trend(closes, highs, lows)
+        cols, array_state = EMAService.compute_trend_arrays(closes, highs, lows)
+
+        assert array_state == state
+        assert [t.state for t in trends] == [
+            (TrendState.NEUTRAL, TrendState.BULLISH, TrendState.BEARISH)[c]
+            for c in cols["state"]
+        ]
+        assert [t.trend_changed_to_bullish for t in trends] == cols["to_bullish"].tolist()
+        assert trends[0].ema_fast == 0.0 and np.isnan(cols["ema_fast"][0])
+
+    def test_stream_matches_batch_trend(self):
+        rng = np.random.default_rng(5)
+        closes = 100 + np.cumsum(rng.normal(0, 1, 120))
+        highs = closes + rng.uniform(0.1, 1.0, 120)
+        lows = closes - rng.uniform(0.1, 1.0, 120)
+
+        trends, state = EMAService.compute_trend(closes, highs, lows)
+        tracker = EMAStateful()
+        streamed = [tracker.update(c, h, l) for c, h, l in zip(closes, highs, lows)]
+
+        assert streamed == trends
+        assert tracker.ready
+        assert tracker.state == state
+
+    def test_stream_waits_for_longest_ema(self):
+        """Lengths need not be ordered: every EMA must seed before ready."""
+        rng = np.random.default_rng(8)
+        closes = 100 + np.cumsum(rng.normal(0, 1, 80))
+        highs = closes + rng.uniform(0.1, 1.0, 80)
+        lows = closes - rng.uniform(0.1, 1.0, 80)
+
+        trends, _ = EMAService.compute_trend(closes, highs, lows, 30, 14, 21)
+        tracker = EMAStateful(30, 14, 21)
+        streamed = [tracker.update(c, h, l) for c, h, l in zip(closes, highs, lows)]
+
+        assert not EMAStateful(30, 14, 21).ready
+        assert streamed[30:] == trends[30:]
+        assert streamed[-1].ema_fast != 0.0
+
     def test_trend_change_fires_once(self):
         """Trend change flags should fire on exactly one bar, not two."""
         n = 80
@@ -271,6 +377,17 @@ class TestZigZagService:
         )
         assert pivots == []
 
+    def test_extend_prices_matches_full_recompute(self):
+        highs, lows = self._make_zigzag_data()
+        zz = ZigZagService(use_ema=True, ema_length=5)
+
+        prices = zz.prepare_prices(highs[:12], lows[:12])
+        extended = zz.extend_prices(highs, lows, prices)
+        full = zz.prepare_prices(highs, lows)
+
+        np.testing.assert_array_equal(extended[0], full[0])
+        np.testing.assert_array_equal(extended[1], full[1])
+
 
 # ╔══════════════════════════════════════════════════════════════╗
 # ║  ReversalDetector                                            ║
@@ -326,6 +443,28 @@ class TestReversalDetector:
         assert len(bearish) >= 1
         assert bearish[0].bar_index == 10
 
+    def test_bar_offset_matches_shifted_prices(self):
+        """bar_offset=cb behaves like prices shifted right by cb bars."""
+        n, cb = 20, 3
+        price_h = np.full(n, 100.0)
+        price_l = np.full(n, 100.0)
+        price_h[11:] = 105.0
+        price_l[11:] = 95.0
+        pivots = [
+            Pivot(price=90.0, actual_price=90.0, bar_index=5, is_high=False),
+            Pivot(price=110.0, actual_price=110.0, bar_index=10, is_high=True),
+        ]
+        shifted_h = np.full(n, np.nan)
+        shifted_l = np.full(n, np.nan)
+        shifted_h[cb:] = price_h[:n - cb]
+        shifted_l[cb:] = price_l[:n - cb]
+
+        detector = ReversalDetector()
+        signals = detector.detect(pivots, n, price_h, price_l, bar_offset=cb)
+
+        assert signals == detector.detect(pivots, n, shifted_h, shifted_l)
+        assert [s.bar_index for s in signals] == [5, 10]
+
     def test_no_signals_without_pivots(self):
         detector = ReversalDetector()
         signals = detector.detect([], 100, np.full(100, 100.0), np.full(100, 100.0))
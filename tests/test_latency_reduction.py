@@ -239,11 +239,12 @@ class TestLatencyReductionIntegration:
         if volumes is None:
             volumes = [1000.0] * n
         return [
-            OHLCVBar(
-                timestamp=i, open=opens[i], high=highs[i],
-                low=lows[i], close=closes[i], volume=volumes[i],
-            )
-            for i in range(n)
+            OHLCVBar(timestamp=i, open=o, high=h, low=l, close=c, volume=v)
+            for i, (o, h, l, c, v) in enumerate(zip(
+                np.asarray(opens).tolist(), np.asarray(highs).tolist(),
+                np.asarray(lows).tolist(), np.asarray(closes).tolist(),
+                np.asarray(volumes).tolist(),
+            ))
         ]
 
     def test_pipeline_runs_with_all_services_enabled(self):
@@ -359,3 +360,91 @@ class TestLatencyReductionIntegration:
         result = uc.execute([])
         assert result is not None
         assert len(result.signals) == 0
+
+    def test_bar_series_matches_bar_list(self):
+        """Passing a prebuilt BarSeries gives the same result as the list."""
+        from reversal_pro.application.use_cases.detect_reversals import (
+            DetectReversalsUseCase,
+        )
+        from reversal_pro.domain.value_objects import BarSeries
+        n = 80
+        np.random.seed(7)
+        closes = 100.0 + np.cumsum(np.random.randn(n))
+        bars = self._make_bars(closes - 0.2, closes + 1.0, closes - 1.0,
+                               closes, np.random.uniform(500, 2000, n))
+        uc = DetectReversalsUseCase(
+            signal_mode=SignalMode.CONFIRMED_PREVIEW,
+            use_matrix_profile=False,
+        )
+
+        series = BarSeries.from_bars(bars)
+        from_list = uc.execute(bars)
+        from_series = uc.execute(series)
+
+        assert len(series) == n
+        np.testing.assert_array_equal(series.closes, closes)
+        assert from_series.signals == from_list.signals
+        assert from_series.pivots == from_list.pivots
+
+    def test_streaming_matches_execute(self):
+        """Pushing bars one by one gives what execute() returns per prefix."""
+        from reversal_pro.application.use_cases.detect_reversals import (
+            DetectReversalsUseCase,
+        )
+        from reversal_pro.application.use_cases.stream_reversals import (
+            StreamingDetectReversals,
+        )
+        n = 150
+        np.random.seed(11)
+        closes = 100.0 + np.cumsum(np.random.randn(n))
+        opens = closes - np.random.uniform(-0.5, 0.5, n)
+        bars = self._make_bars(
+            opens, np.maximum(opens, closes) + np.random.uniform(0, 1, n),
+            np.minimum(opens, closes) - np.random.uniform(0, 1, n),
+            closes, np.random.uniform(500, 2000, n),
+        )
+        uc = DetectReversalsUseCase(
+            signal_mode=SignalMode.CONFIRMED_PREVIEW,
+            confirmation_bars=2,
+            use_matrix_profile=False,
+        )
+        stream = StreamingDetectReversals(uc)
+        stream.extend(bars[:uc.ema_slow])
+
+        for k in range(uc.ema_slow, n):
+            streamed = stream.push(bars[k])
+            batch = uc.execute(bars[:k + 1])
+            assert streamed.signals == batch.signals
+            assert streamed.pivots == batch.pivots
+            assert streamed.current_threshold == batch.current_threshold
+            assert streamed.current_trend == batch.current_trend
+
+    def test_streaming_rejects_matrix_profile(self):
+        from reversal_pro.application.use_cases.detect_reversals import (
+            DetectReversalsUseCase,
+        )
+        from reversal_pro.application.use_cases.stream_reversals import (
+            StreamingDetectReversals,
+        )
+        with pytest.raises(ValueError):
+            StreamingDetectReversals(DetectReversalsUseCase(use_matrix_profile=True))
+
+    def test_trend_columns_match_trend_history(self):
+        """execute() keeps the trend columns that trend_history is built from."""
+        from reversal_pro.application.use_cases.detect_reversals import (
+            DetectReversalsUseCase,
+        )
+        n = 60
+        np.random.seed(3)
+        closes = 100.0 + np.cumsum(np.random.randn(n))
+        bars = self._make_bars(closes, closes + 1.0, closes - 1.0, closes)
+        result = DetectReversalsUseCase(use_matrix_profile=False).execute(bars)
+
+        cols = result.trend_columns
+        assert len(cols["ema_slow"]) == len(result.trend_history) == n
+        assert np.nan_to_num(cols["ema_fast"], nan=0.0).tolist() == [
+            t.ema_fast for t in result.trend_history
+        ]
+        assert cols["buy_signal"].tolist() == [
+            t.buy_signal for t in result.trend_history
+        ]